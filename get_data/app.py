@@ -1,9 +1,18 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 import yfinance as yf
+from curl_cffi import requests as curl_requests
+import plotly
 import plotly.graph_objects as go
 import pandas as pd
+import os
+import json
+import pickle
+import threading
+from dataclasses import dataclass, asdict
+from datetime import date
 from functools import lru_cache
+from typing import Optional
 
 app = Flask(__name__)
 CORS(app)  # CORS für alle Routen aktivieren
@@ -18,54 +27,241 @@ CONFIG = {
         #'Kurzfristige Verbindlichkeiten': '#2ca02c',  # Grün
         'TICKER_COLORS': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
     },
-    'DEFAULT_YEARS': ['2023', '2024']
+    'DEFAULT_YEARS': ['2023', '2024'],
+    # Lokaler Datenspeicher für aufbereitete Bilanzdaten (Batch-Berichte, Offline-Betrieb)
+    'DATA_STORE_DIR': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_store')
 }
 
-def get_company_info(symbols):
-    return {symbol: yf.Ticker(symbol).info for symbol in symbols}
+@dataclass(slots=True)
+class CompanyInfo:
+    """
+    Kompakte Unternehmensinformationen.
+
+    Statt des vollständigen yfinance-`.info`-Dicts (über 100 Schlüssel inkl. langer
+    Beschreibungen) werden nur die Felder gehalten, die in der Anwendung verwendet werden.
+    """
+    symbol: str
+    short_name: Optional[str] = None
+    sector: Optional[str] = None
+    country: Optional[str] = None
+    full_time_employees: Optional[int] = None
+
+    @classmethod
+    def from_info(cls, symbol, info):
+        """
+        Extrahiert die benötigten Felder aus einem yfinance-`.info`-Dict.
+
+        Args:
+            symbol (str): Das Ticker-Symbol.
+            info (dict): Das vollständige `.info`-Dict.
+
+        Returns:
+            CompanyInfo: Der kompakte Datensatz.
+        """
+        return cls(
+            symbol=symbol,
+            short_name=info.get('shortName'),
+            sector=info.get('sector'),
+            country=info.get('country'),
+            full_time_employees=info.get('fullTimeEmployees')
+        )
+
+# Gemeinsame HTTP-Session für alle yfinance-Abfragen (Cookie/Crumb und Verbindungen werden geteilt)
+HTTP_SESSION = None
+HTTP_SESSION_LOCK = threading.Lock()
+
+def get_http_session():
+    """
+    Gibt die gemeinsame HTTP-Session für alle yfinance-Abfragen zurück.
+
+    Cookie und Crumb werden von allen Threads geteilt. curl_cffi verwendet jedoch
+    pro Thread ein eigenes curl-Handle, sodass Verbindungen nur innerhalb eines Threads
+    wiederverwendet werden (z.B. innerhalb eines Dashboard-Aufbaus, nicht zwischen
+    verschiedenen Flask-Anfragen).
 
-def create_company_table(symbols):
+    Returns:
+        curl_cffi.requests.Session: Die Session für alle yfinance-Abfragen.
+    """
+    global HTTP_SESSION
+    with HTTP_SESSION_LOCK:
+        if HTTP_SESSION is None:
+            HTTP_SESSION = curl_requests.Session(impersonate='chrome')
+    return HTTP_SESSION
+
+def get_ticker(ticker_symbol):
+    return yf.Ticker(ticker_symbol, session=get_http_session())
+
+def fetch_company_info(ticker_symbol):
     """
-    Erstellt eine Tabelle mit Unternehmensinformationen.
+    Liest die Unternehmensinformationen eines Tickers aus `.info`.
+
+    Wird nur für die Unternehmenstabelle und die Ticker-Prüfung benötigt; das
+    yf.Ticker-Objekt (und damit das vollständige `.info`-Dict) wird danach verworfen.
 
     Args:
-        symbols (list): Liste der Ticker-Symbole.
+        ticker_symbol (str): Das Ticker-Symbol.
 
     Returns:
-        plotly.graph_objects.Figure: Die erstellte Tabelle.
+        CompanyInfo: Der kompakte Datensatz (short_name ist None für unbekannte Symbole).
     """
-    data = get_company_info(symbols)
-    namen = [data[symbol].get('shortName', 'N/A') for symbol in data]
-    branchen = [data[symbol].get('sector', 'N/A') for symbol in data]
-    länder = [data[symbol].get('country', 'N/A') for symbol in data]
-    mitarbeiter = [data[symbol].get('fullTimeEmployees', 'N/A') for symbol in data]
+    return CompanyInfo.from_info(ticker_symbol, get_ticker(ticker_symbol).info or {})
 
-    # Dynamische Höhe basierend auf der Anzahl der Zeilen
-    row_count = len(namen)
-    row_height = 50  # Höhe pro Zeile in Pixeln
-    table_height = row_count * row_height + 50  # Zusätzliche Höhe für Header und Puffer
+@dataclass(slots=True)
+class FinancialStatements:
+    """
+    Abschlüsse eines Tickers.
 
-    fig = go.Figure(data=[go.Table(
-        header=dict(values=['Unternehmen', 'Branche', 'Land', 'Mitarbeiter'],
-                    fill_color='paleturquoise',
-                    align='left'),
-        cells=dict(values=[namen, branchen, länder, mitarbeiter],
-                   fill_color='lavender',
-                   align='left'))
-    ])
+    Jahresbilanz und Gewinn- und Verlustrechnung werden beim Abruf geladen. Quartalsbilanz
+    und Kapitalflussrechnung werden erst beim ersten Zugriff nachgeladen und danach im
+    (zwischengespeicherten) Datensatz gehalten, also höchstens einmal pro Ticker abgefragt.
+    """
+    symbol: str
+    balance_sheet: pd.DataFrame
+    income_statement: pd.DataFrame
+    quarterly_balance_sheet: Optional[pd.DataFrame] = None
+    cash_flow: Optional[pd.DataFrame] = None
+
+    def load_lazy(self, field, ticker_attribute):
+        """
+        Gibt ein nachzuladendes Feld zurück und lädt es beim ersten Zugriff.
+
+        Args:
+            field (str): Name des Feldes im Datensatz.
+            ticker_attribute (str): Zugehöriges Attribut von yf.Ticker.
+
+        Returns:
+            pd.DataFrame: Die Daten (leer, falls nicht verfügbar).
+        """
+        value = getattr(self, field)
+        if value is None:
+            value = getattr(get_ticker(self.symbol), ticker_attribute)
+            # Leere Ergebnisse nicht festhalten, damit ein späterer Zugriff erneut abfragt
+            if value is not None and not value.empty:
+                setattr(self, field, value)
+        return value
 
-    # Layout-Eigenschaften anpassen
-    fig.update_layout(
-        autosize=True,
-        height=table_height,
-        margin=dict(l=20, r=20, t=20, b=20)
+@lru_cache(maxsize=128)
+def fetch_financial_statements(ticker_symbol):
+    """
+    Holt Jahresbilanz und Gewinn- und Verlustrechnung eines Tickers in einem Durchgang.
+
+    Die Abschlüsse werden ohne `.info` abgefragt, damit Listings ohne `shortName`
+    funktionieren und keine quoteSummary-Anfragen anfallen. Gibt es keine Bilanzdaten,
+    wird ein LookupError geworfen; Fehlschläge werden so nicht zwischengespeichert.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+
+    Returns:
+        FinancialStatements: Die Abschlüsse des Tickers.
+    """
+    ticker = get_ticker(ticker_symbol)
+    balance_sheet = ticker.balance_sheet
+    if balance_sheet is None or balance_sheet.empty:
+        raise LookupError(f"Keine Bilanzdaten für {ticker_symbol} gefunden.")
+
+    return FinancialStatements(
+        symbol=ticker_symbol,
+        balance_sheet=balance_sheet,
+        income_statement=ticker.income_stmt
     )
-    return fig
+
+def get_quarterly_balance_sheet(ticker_symbol):
+    return fetch_financial_statements(ticker_symbol).load_lazy('quarterly_balance_sheet', 'quarterly_balance_sheet')
+
+def get_cash_flow(ticker_symbol):
+    return fetch_financial_statements(ticker_symbol).load_lazy('cash_flow', 'cashflow')
+
+def get_company_info_path(symbol):
+    return os.path.join(CONFIG['DATA_STORE_DIR'], 'company_info', f"{symbol.upper()}.json")
+
+def save_company_info(company_info):
+    """
+    Speichert die Unternehmensinformationen eines Tickers im lokalen Datenspeicher.
+
+    Args:
+        company_info (CompanyInfo): Der zu speichernde Datensatz.
+    """
+    path = get_company_info_path(company_info.symbol)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(company_info), f)
+    os.replace(tmp_path, path)
+
+@lru_cache(maxsize=1024)
+def load_known_company_info(symbol, offline=False):
+    """
+    Holt die kompakten Unternehmensinformationen eines bekannten Tickers.
+
+    Die Felder werden einmalig aus `.info` extrahiert und im lokalen Datenspeicher
+    abgelegt; danach werden sie nur noch von dort gelesen. Für unbekannte Symbole wird
+    ein LookupError geworfen, sodass Fehlschläge nicht zwischengespeichert werden.
+
+    Args:
+        symbol (str): Das Ticker-Symbol.
+        offline (bool): Wenn True, werden keine Daten aus dem Netz geladen.
+
+    Returns:
+        CompanyInfo: Die Unternehmensinformationen.
+    """
+    path = get_company_info_path(symbol)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return CompanyInfo(**json.load(f))
+    if offline:
+        raise LookupError(f"Keine lokalen Unternehmensinformationen für {symbol} vorhanden (Offline-Modus).")
+
+    company_info = fetch_company_info(symbol)
+    # Nur echte Treffer speichern, damit Tippfehler aus der Autovervollständigung nicht den Speicher füllen
+    if company_info.short_name is None:
+        raise LookupError(f"Keine Unternehmensinformationen für {symbol} gefunden.")
+    save_company_info(company_info)
+    return company_info
+
+def load_company_info(symbol, offline=False):
+    """
+    Holt die Unternehmensinformationen eines Tickers.
+
+    Args:
+        symbol (str): Das Ticker-Symbol.
+        offline (bool): Wenn True, werden keine Daten aus dem Netz geladen.
+
+    Returns:
+        CompanyInfo: Die Unternehmensinformationen (leer für unbekannte Symbole).
+    """
+    try:
+        return load_known_company_info(symbol, offline)
+    except LookupError:
+        if offline:
+            raise
+        return CompanyInfo(symbol)
+
+def get_stored_company_info(symbol):
+    """
+    Gibt die bereits gespeicherten Unternehmensinformationen eines Tickers zurück, ohne `.info` abzufragen.
+
+    Args:
+        symbol (str): Das Ticker-Symbol.
+
+    Returns:
+        CompanyInfo: Die Unternehmensinformationen (leer, falls keine gespeichert sind, z.B. ohne `shortName`).
+    """
+    try:
+        return load_company_info(symbol, offline=True)
+    except LookupError:
+        return CompanyInfo(symbol)
+
+def get_company_info(symbols, offline=False):
+    return {symbol: load_company_info(symbol, offline) for symbol in symbols}
 
 def get_filtered_balance_sheet(ticker_symbol):
     """
     Holt und filtert die Bilanzdaten eines Unternehmens.
 
+    Der Jahresüberschuss aus der Gewinn- und Verlustrechnung wird mit aufgenommen,
+    damit Rentabilitätskennzahlen ohne weiteren Abruf berechnet werden können.
+
     Args:
         ticker_symbol (str): Das Ticker-Symbol.
 
@@ -78,12 +274,17 @@ def get_filtered_balance_sheet(ticker_symbol):
         'Total Liabilities Net Minority Interest', 'Current Liabilities',
         'Total Non Current Liabilities Net Minority Interest'
     ]
-    ticker = yf.Ticker(ticker_symbol)
-    balance_sheet = ticker.balancesheet
+    statements = fetch_financial_statements(ticker_symbol)
+    balance_sheet = statements.balance_sheet
 
     # Filtere nur die relevanten Indizes
     filtered_balance_sheet = balance_sheet.loc[indices]
 
+    # Jahresüberschuss aus der Gewinn- und Verlustrechnung ergänzen (gleiche Stichtage)
+    income_statement = statements.income_statement
+    if 'Net Income' in income_statement.index:
+        filtered_balance_sheet.loc['Net Income'] = income_statement.loc['Net Income'].reindex(filtered_balance_sheet.columns)
+
     # Konvertiere die Spaltennamen in Jahreszahlen und sortiere sie
     filtered_balance_sheet.columns = filtered_balance_sheet.columns.astype(str).str[:4]
     filtered_balance_sheet = filtered_balance_sheet.sort_index(axis=1, ascending=True)
@@ -97,7 +298,12 @@ def get_usd_to_eur_exchange_rate():
     Returns:
         float: Der Wechselkurs.
     """
-    ticker = yf.Ticker("USDEUR=X")
+    return get_daily_usd_to_eur_exchange_rate(date.today().isoformat())
+
+@lru_cache(maxsize=1)
+def get_daily_usd_to_eur_exchange_rate(day):
+    # Der Kurs wird nur einmal pro Tag abgefragt statt einmal pro Ticker
+    ticker = get_ticker("USDEUR=X")
     exchange_rate = ticker.history(period="1d")['Close'].iloc[-1]
     return exchange_rate
 
@@ -137,6 +343,8 @@ def calculate_kpis(df):
     df.loc['2. Liquidity_Ratio'] = ((df.loc['Current Assets'] - df.loc['Inventory']) / df.loc['Current Liabilities']) * 100
     df.loc['3. Liquidity_Ratio'] = (df.loc['Cash Cash Equivalents And Short Term Investments'] / df.loc['Current Liabilities']) * 100
     df.loc['Net_Working_Capital'] = df.loc['Current Assets'] - df.loc['Current Liabilities']
+    if 'Net Income' in df.index:
+        df.loc['Return_On_Equity'] = (df.loc['Net Income'] / df.loc['Stockholders Equity']) * 100
     return df
 
 def translate_indices(df):
@@ -168,7 +376,9 @@ def translate_indices(df):
         '1. Liquidity_Ratio': '1. Liquiditätsquote',
         '2. Liquidity_Ratio': '2. Liquiditätsquote',
         '3. Liquidity_Ratio': '3. Liquiditätsquote',
-        'Net_Working_Capital': 'Netto-Umlaufvermögen'
+        'Net_Working_Capital': 'Netto-Umlaufvermögen',
+        'Net Income': 'Jahresüberschuss',
+        'Return_On_Equity': 'Eigenkapitalrentabilität'
     }
     df.rename(index=translations, inplace=True)
     return df
@@ -204,10 +414,92 @@ def get_balance_sheet(ticker_symbol):
     balance_sheet_german = translate_indices(balance_sheet_kpi)
     return balance_sheet_german
 
+def get_data_store_path(ticker_symbol):
+    """
+    Gibt den Pfad der Datei im lokalen Datenspeicher für ein Ticker-Symbol zurück.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+
+    Returns:
+        str: Pfad zur Pickle-Datei des Tickers.
+    """
+    return os.path.join(CONFIG['DATA_STORE_DIR'], f"{ticker_symbol.upper()}.pkl")
+
+def load_from_data_store(ticker_symbol):
+    """
+    Lädt die aufbereiteten Daten eines Tickers aus dem lokalen Datenspeicher.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+
+    Returns:
+        dict: Gespeicherte Daten ('balance_sheet') oder None, falls nicht vorhanden.
+    """
+    path = get_data_store_path(ticker_symbol)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def save_to_data_store(ticker_symbol, balance_sheet):
+    """
+    Speichert die aufbereiteten Daten eines Tickers im lokalen Datenspeicher.
+
+    Die Datei wird zuerst temporär geschrieben und dann umbenannt, damit parallel
+    laufende Prozesse nie eine halb geschriebene Datei lesen.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+        balance_sheet (pd.DataFrame): Die aufbereiteten Bilanzdaten (inkl. KPIs).
+    """
+    os.makedirs(CONFIG['DATA_STORE_DIR'], exist_ok=True)
+    path = get_data_store_path(ticker_symbol)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'balance_sheet': balance_sheet}, f)
+    os.replace(tmp_path, path)
+
 def is_valid_ticker(ticker_symbol):
-    ticker = yf.Ticker(ticker_symbol)
-    balance_sheet = ticker.balancesheet
-    return not balance_sheet.empty
+    try:
+        fetch_financial_statements(ticker_symbol)
+        return True
+    except LookupError:
+        return False
+
+def get_structural_balance_sheet_rows(balance_sheet):
+    """
+    Berechnet die Werte der Strukturbilanz je Jahr (neuestes Jahr zuerst).
+
+    Wird von der HTML-Tabelle im Dashboard und der Tabelle in den Batch-Berichten
+    verwendet, damit beide dieselben Werte und Summen zeigen.
+
+    Args:
+        balance_sheet (pd.DataFrame): Die aufbereiteten Bilanzdaten.
+
+    Returns:
+        list: Ein dict pro Jahr mit 'year', 'anlage', 'umlauf', 'summe_aktiva', 'ek',
+        'fk_lang', 'fk_kurz' und 'summe_passiva'.
+    """
+    years = [col for col in balance_sheet.columns if col in CONFIG['DEFAULT_YEARS']]
+    rows = []
+    for year in sorted(years, reverse=True):
+        anlage = balance_sheet.loc['Gesamtanlagevermögen', year]
+        umlauf = balance_sheet.loc['Umlaufvermögen', year]
+        ek = balance_sheet.loc['Eigenkapital', year]
+        fk_lang = balance_sheet.loc['Langfristige Verbindlichkeiten', year]
+        fk_kurz = balance_sheet.loc['Kurzfristige Verbindlichkeiten', year]
+        rows.append({
+            'year': year,
+            'anlage': anlage,
+            'umlauf': umlauf,
+            'summe_aktiva': anlage + umlauf,
+            'ek': ek,
+            'fk_lang': fk_lang,
+            'fk_kurz': fk_kurz,
+            'summe_passiva': ek + fk_lang + fk_kurz
+        })
+    return rows
 
 def create_structural_balance_sheet_table(ticker_symbols):
     """
@@ -222,25 +514,18 @@ def create_structural_balance_sheet_table(ticker_symbols):
     html_tables = ""
 
     for ticker in ticker_symbols:
-        balance_sheet = get_balance_sheet(ticker)
-        years = [col for col in balance_sheet.columns if col in ['2023', '2024']]
-        if not years:
-            print(f"Keine Bilanzdaten für 2023 oder 2024 für {ticker} gefunden.")
+        rows = get_structural_balance_sheet_rows(get_balance_sheet(ticker))
+        if not rows:
+            print(f"Keine Bilanzdaten für {' oder '.join(CONFIG['DEFAULT_YEARS'])} für {ticker} gefunden.")
             continue
 
-        # Überschrift für den Ticker hinzufügen
-        
-
-        for year in sorted(years, reverse=True):
-            # Werte extrahieren
-            anlage = balance_sheet.loc['Gesamtanlagevermögen', year]
-            umlauf = balance_sheet.loc['Umlaufvermögen', year]
-            summe_aktiva = anlage + umlauf
+        # Tabellen je Ticker gruppieren, damit sie bei Delta-Updates einzeln entfernt werden können
+        html_tables += f'<div class="bilanz-ticker" data-ticker="{ticker}">'
 
-            ek = balance_sheet.loc['Eigenkapital', year]
-            fk_lang = balance_sheet.loc['Langfristige Verbindlichkeiten', year]
-            fk_kurz = balance_sheet.loc['Kurzfristige Verbindlichkeiten', year]
-            summe_passiva = ek + fk_lang + fk_kurz
+        for row in rows:
+            year = row['year']
+            anlage, umlauf, summe_aktiva = row['anlage'], row['umlauf'], row['summe_aktiva']
+            ek, fk_lang, fk_kurz, summe_passiva = row['ek'], row['fk_lang'], row['fk_kurz'], row['summe_passiva']
 
             # HTML-Tabelle erstellen
             table_html = f"""
@@ -320,110 +605,123 @@ def create_structural_balance_sheet_table(ticker_symbols):
             """
             html_tables += table_html
 
+        html_tables += '</div>'
+
     return html_tables
 
-def create_dashboard(symbols):
+def get_ticker_colors(symbols, fixed_colors=None):
     """
-    Erstellt ein gestapeltes Balkendiagramm für Kapital und Verbindlichkeiten der Unternehmen.
+    Ordnet jedem Ticker eine Farbe aus der globalen Konfiguration zu.
+
+    Bereits vergebene Farben (z.B. von Tickern, die im Browser schon angezeigt werden)
+    bleiben erhalten; neue Ticker erhalten die erste noch freie Farbe. Vorgegebene Farben,
+    die nicht aus der Konfiguration stammen (z.B. manipulierte Client-Daten), werden ignoriert.
 
     Args:
         symbols (list): Liste der Ticker-Symbole.
+        fixed_colors (dict, optional): Bereits vergebene Farben je Ticker.
 
     Returns:
-        plotly.graph_objects.Figure: Das erstellte Balkendiagramm.
+        dict: Farbe (Hex-Code) je Ticker.
     """
-    balance_sheets = {ticker: get_balance_sheet(ticker) for ticker in symbols}
-    fig = go.Figure()
-
-    # Farben aus der globalen Konfiguration
     ticker_colors = CONFIG['COLORS']['TICKER_COLORS']
+    colors = {
+        ticker: color for ticker, color in (fixed_colors or {}).items()
+        if ticker in symbols and color in ticker_colors
+    }
+    for ticker in symbols:
+        if ticker in colors:
+            continue
+        free_colors = [color for color in ticker_colors if color not in colors.values()]
+        colors[ticker] = free_colors[0] if free_colors else ticker_colors[len(colors) % len(ticker_colors)]
+    return colors
+
+def get_balance_sheets(ticker_symbols, balance_sheets=None):
+    preloaded = balance_sheets or {}
+    return {ticker: preloaded[ticker] if ticker in preloaded else get_balance_sheet(ticker) for ticker in ticker_symbols}
+
+def get_sorted_years(balance_sheets):
+    # Sammle alle Jahre aus den Balance Sheets und sortiere sie numerisch
+    all_years = set()
+    for balance_sheet in balance_sheets.values():
+        all_years.update(balance_sheet.columns)
+    return sorted(all_years, key=lambda x: int(x))
+
+def get_kpi_values(balance_sheet, kpi, years):
+    return [balance_sheet.loc[kpi, year] if year in balance_sheet.columns else None for year in years]
+
+# Komponenten des gestapelten Balkendiagramms mit Deckkraft der Basisfarbe
+DASHBOARD_COMPONENTS = [
+    ('Eigenkapital', 1.0),
+    ('Langfristige Verbindlichkeiten', 0.7),
+    ('Kurzfristige Verbindlichkeiten', 0.4)
+]
+
+# KPIs des Liniendiagramms: (Zeile im Balance Sheet, Bezeichnung)
+LINE_CHART_KPIS = [
+    ('Eigenkapitalquote', 'Eigenkapitalquote'),
+    ('Fremdkapitalquote', 'Fremdkapitalquote'),
+    ('Fremdkapitalquote', 'Statischer Verschuldungsgrad')
+]
+
+def create_dashboard_traces(ticker, balance_sheet, base_color, show_legend):
+    """
+    Erstellt die Balken eines Tickers für das Kapital-und-Verbindlichkeiten-Diagramm.
+
+    Args:
+        ticker (str): Das Ticker-Symbol.
+        balance_sheet (pd.DataFrame): Die aufbereiteten Bilanzdaten.
+        base_color (str): Basisfarbe des Tickers als Hex-Code.
+        show_legend (bool): Ob die Komponenten in der Legende erscheinen.
+
+    Returns:
+        list: Die Balken (go.Bar) je Komponente und Jahr.
+    """
+    rgb = f'{int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}'
 
-    # Kontrollvariablen, um die Legende nur einmal pro Komponente anzuzeigen
-    show_legend = {
-        'Eigenkapital': True,
-        'Langfristige Verbindlichkeiten': True,
-        'Kurzfristige Verbindlichkeiten': True
+    # Berechnung der Summen für 2023 und 2024
+    totals = {
+        year: sum(balance_sheet.loc[component, year] for component, _ in DASHBOARD_COMPONENTS)
+        for year in ['2023', '2024']
     }
 
-    for index, (ticker, balance_sheet) in enumerate(balance_sheets.items()):
-        base_color = ticker_colors[index % len(ticker_colors)]  # Zyklische Auswahl der Basisfarbe
+    traces = []
+    for component, opacity in DASHBOARD_COMPONENTS:
+        for year in ['2023', '2024']:
+            value = balance_sheet.loc[component, year]
+            traces.append(go.Bar(
+                x=[f'{ticker} {year}'],
+                y=[value],
+                name=component,
+                meta={'ticker': ticker},
+                marker=dict(color=f'rgba({rgb}, {opacity})'),
+                hovertemplate=f'{component}: %{{y:,.0f}} €<br>Prozentual: %{{customdata:.1%}}',
+                customdata=[value / totals[year] if totals[year] != 0 else 0],
+                # Nur der erste Balken je Komponente erscheint in der Legende
+                showlegend=show_legend and year == '2023'
+            ))
+    return traces
+
+def create_dashboard(symbols, balance_sheets=None, colors=None):
+    """
+    Erstellt ein gestapeltes Balkendiagramm für Kapital und Verbindlichkeiten der Unternehmen.
 
-        # Berechnung der Summen für 2023 und 2024
-        total_2023 = (
-            balance_sheet.loc['Eigenkapital', '2023'] +
-            balance_sheet.loc['Langfristige Verbindlichkeiten', '2023'] +
-            balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2023']
-        )
-        total_2024 = (
-            balance_sheet.loc['Eigenkapital', '2024'] +
-            balance_sheet.loc['Langfristige Verbindlichkeiten', '2024'] +
-            balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2024']
-        )
+    Args:
+        symbols (list): Liste der Ticker-Symbole.
+        balance_sheets (dict, optional): Bereits geladene Bilanzdaten je Ticker.
+        colors (dict, optional): Farbe je Ticker (Standard: Reihenfolge der Konfiguration).
+
+    Returns:
+        plotly.graph_objects.Figure: Das erstellte Balkendiagramm.
+    """
+    balance_sheets = get_balance_sheets(symbols, balance_sheets)
+    colors = colors or get_ticker_colors(symbols)
+    fig = go.Figure()
 
-        # Eigenkapital für 2023 und 2024
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2023'],
-            y=[balance_sheet.loc['Eigenkapital', '2023']],
-            name='Eigenkapital',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 1.0)'),
-            hovertemplate='Eigenkapital: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Eigenkapital', '2023'] / total_2023 if total_2023 != 0 else 0],
-            showlegend=show_legend['Eigenkapital']
-        ))
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2024'],
-            y=[balance_sheet.loc['Eigenkapital', '2024']],
-            name='Eigenkapital',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 1.0)'),
-            hovertemplate='Eigenkapital: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Eigenkapital', '2024'] / total_2024 if total_2024 != 0 else 0],
-            showlegend=False  # Nach dem ersten Auftreten deaktivieren
-        ))
-
-        # Langfristige Verbindlichkeiten für 2023 und 2024
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2023'],
-            y=[balance_sheet.loc['Langfristige Verbindlichkeiten', '2023']],
-            name='Langfristige Verbindlichkeiten',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.7)'),
-            hovertemplate='Langfristige Verbindlichkeiten: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Langfristige Verbindlichkeiten', '2023'] / total_2023 if total_2023 != 0 else 0],
-            showlegend=show_legend['Langfristige Verbindlichkeiten']
-        ))
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2024'],
-            y=[balance_sheet.loc['Langfristige Verbindlichkeiten', '2024']],
-            name='Langfristige Verbindlichkeiten',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.7)'),
-            hovertemplate='Langfristige Verbindlichkeiten: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Langfristige Verbindlichkeiten', '2024'] / total_2024 if total_2024 != 0 else 0],
-            showlegend=False  # Nach dem ersten Auftreten deaktivieren
-        ))
-
-        # Kurzfristige Verbindlichkeiten für 2023 und 2024
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2023'],
-            y=[balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2023']],
-            name='Kurzfristige Verbindlichkeiten',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.4)'),
-            hovertemplate='Kurzfristige Verbindlichkeiten: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2023'] / total_2023 if total_2023 != 0 else 0],
-            showlegend=show_legend['Kurzfristige Verbindlichkeiten']
-        ))
-        fig.add_trace(go.Bar(
-            x=[f'{ticker} 2024'],
-            y=[balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2024']],
-            name='Kurzfristige Verbindlichkeiten',
-            marker=dict(color=f'rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.4)'),
-            hovertemplate='Kurzfristige Verbindlichkeiten: %{y:,.0f} €<br>Prozentual: %{customdata:.1%}',
-            customdata=[balance_sheet.loc['Kurzfristige Verbindlichkeiten', '2024'] / total_2024 if total_2024 != 0 else 0],
-            showlegend=False  # Nach dem ersten Auftreten deaktivieren
-        ))
-
-        # Nach dem ersten Ticker die Legende für diese Komponenten deaktivieren
-        show_legend['Eigenkapital'] = False
-        show_legend['Langfristige Verbindlichkeiten'] = False
-        show_legend['Kurzfristige Verbindlichkeiten'] = False
+    for index, (ticker, balance_sheet) in enumerate(balance_sheets.items()):
+        # Legende nur beim ersten Ticker anzeigen
+        for trace in create_dashboard_traces(ticker, balance_sheet, colors[ticker], show_legend=index == 0):
+            fig.add_trace(trace)
 
     # Layout anpassen
     fig.update_layout(
@@ -445,66 +743,48 @@ def create_dashboard(symbols):
 
     return fig
 
+def create_line_chart_traces(ticker, balance_sheet, color, x_values, visible_kpi=None):
+    """
+    Erstellt die Linien eines Tickers für das KPI-Liniendiagramm, eine je KPI.
 
-def create_line_chart(ticker_symbols):
-    balance_sheets = {}
-    fig = go.Figure()
-
-    # Farben aus der globalen Konfiguration
-    TICKER_COLORS = CONFIG['COLORS']['TICKER_COLORS']
-    company_colors = {ticker: TICKER_COLORS[i] for i, ticker in enumerate(ticker_symbols)}
-
-    # Sammle alle Jahre aus den Balance Sheets
-    all_years = set()
-    for ticker in ticker_symbols:
-        balance_sheets[ticker] = get_balance_sheet(ticker)
-        all_years.update(balance_sheets[ticker].columns)
-
-    # Sortiere die Jahre numerisch
-    sorted_years = sorted(all_years, key=lambda x: int(x))
-
-
-    # Eigenkapitalquote
-    for ticker, balance_sheet in balance_sheets.items():
-        x_values = sorted_years
-        y_values = [balance_sheet.loc['Eigenkapitalquote', year] if year in balance_sheet.columns else None for year in x_values]
-
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values,
-            mode='lines+markers',
-            name=f'{ticker} Eigenkapitalquote',
-            line=dict(color=company_colors[ticker]),
-            visible=True
-        ))
-
-    # Fremdkapitalquote
-    for ticker, balance_sheet in balance_sheets.items():
-        x_values = sorted_years
-        y_values = [balance_sheet.loc['Fremdkapitalquote', year] if year in balance_sheet.columns else None for year in x_values]
+    Args:
+        ticker (str): Das Ticker-Symbol.
+        balance_sheet (pd.DataFrame): Die aufbereiteten Bilanzdaten.
+        color (str): Farbe des Tickers.
+        x_values (list): Die Jahre der x-Achse.
+        visible_kpi (str, optional): Sichtbare KPI (Standard: die erste).
 
-        fig.add_trace(go.Scatter(
+    Returns:
+        list: Die Linien (go.Scatter) in der Reihenfolge von LINE_CHART_KPIS.
+    """
+    visible_kpi = visible_kpi or LINE_CHART_KPIS[0][1]
+    return [
+        go.Scatter(
             x=x_values,
-            y=y_values,
+            y=get_kpi_values(balance_sheet, row, x_values),
             mode='lines+markers',
-            name=f'{ticker} Fremdkapitalquote',
-            line=dict(color=company_colors[ticker]),
-            visible=False
-        ))
+            name=f'{ticker} {label}',
+            meta={'ticker': ticker, 'kpi': label},
+            line=dict(color=color),
+            visible=label == visible_kpi
+        )
+        for row, label in LINE_CHART_KPIS
+    ]
 
-    # Statischer Verschuldungsgrad
-    for ticker, balance_sheet in balance_sheets.items():
-        x_values = sorted_years
-        y_values = [balance_sheet.loc['Fremdkapitalquote', year] if year in balance_sheet.columns else None for year in x_values]
+def create_line_chart(ticker_symbols, balance_sheets=None, colors=None):
+    balance_sheets = get_balance_sheets(ticker_symbols, balance_sheets)
+    company_colors = colors or get_ticker_colors(ticker_symbols)
+    sorted_years = get_sorted_years(balance_sheets)
+    fig = go.Figure()
 
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values,
-            mode='lines+markers',
-            name=f'{ticker} Statischer Verschuldungsgrad',
-            line=dict(color=company_colors[ticker]),
-            visible=False
-        ))
+    # Linien je Ticker erstellen und nach KPI gruppiert hinzufügen
+    ticker_traces = [
+        create_line_chart_traces(ticker, balance_sheet, company_colors[ticker], sorted_years)
+        for ticker, balance_sheet in balance_sheets.items()
+    ]
+    for kpi_index in range(len(LINE_CHART_KPIS)):
+        for traces in ticker_traces:
+            fig.add_trace(traces[kpi_index])
 
     # Layout
     fig.update_layout(
@@ -539,45 +819,37 @@ def create_line_chart(ticker_symbols):
 
     return fig
 
-def create_coverage_ratios_chart(ticker_symbols):
-    balance_sheets = {}
-    fig = go.Figure()
-
-    # Farben aus der globalen Konfiguration
-    TICKER_COLORS = CONFIG['COLORS']['TICKER_COLORS']
-    company_colors = {ticker: TICKER_COLORS[i] for i, ticker in enumerate(ticker_symbols)}
-
-    # Sammle alle Jahre aus den Balance Sheets
-    all_years = set()
-    for ticker in ticker_symbols:
-        balance_sheets[ticker] = get_balance_sheet(ticker)
-        all_years.update(balance_sheets[ticker].columns)
-
-    # Sortiere die Jahre numerisch
-    sorted_years = sorted(all_years, key=lambda x: int(x))
-
-    for ticker, balance_sheet in balance_sheets.items():
-        x_values = sorted_years
-        y_values_coverage_1 = [balance_sheet.loc['Anlagendeckungsgrad 1', year] if year in balance_sheet.columns else None for year in x_values]
-        y_values_coverage_2 = [balance_sheet.loc['Anlagendeckungsgrad 2', year] if year in balance_sheet.columns else None for year in x_values]
-
+def create_coverage_ratios_traces(ticker, balance_sheet, color, x_values):
+    return [
         # 1. Anlagendeckung
-        fig.add_trace(go.Scatter(
+        go.Scatter(
             x=x_values,
-            y=y_values_coverage_1,
+            y=get_kpi_values(balance_sheet, 'Anlagendeckungsgrad 1', x_values),
             mode='lines+markers',
             name=f'{ticker} Anlagendeckungsgrad 1',
-            line=dict(color=company_colors[ticker])
-        ))
-
+            meta={'ticker': ticker},
+            line=dict(color=color)
+        ),
         # 2. Anlagendeckung
-        fig.add_trace(go.Scatter(
+        go.Scatter(
             x=x_values,
-            y=y_values_coverage_2,
+            y=get_kpi_values(balance_sheet, 'Anlagendeckungsgrad 2', x_values),
             mode='lines+markers',
             name=f'{ticker} Anlagendeckungsgrad 2',
-            line=dict(color=company_colors[ticker], dash='dash')
-        ))
+            meta={'ticker': ticker},
+            line=dict(color=color, dash='dash')
+        )
+    ]
+
+def create_coverage_ratios_chart(ticker_symbols, balance_sheets=None, colors=None):
+    balance_sheets = get_balance_sheets(ticker_symbols, balance_sheets)
+    company_colors = colors or get_ticker_colors(ticker_symbols)
+    sorted_years = get_sorted_years(balance_sheets)
+    fig = go.Figure()
+
+    for ticker, balance_sheet in balance_sheets.items():
+        for trace in create_coverage_ratios_traces(ticker, balance_sheet, company_colors[ticker], sorted_years):
+            fig.add_trace(trace)
 
     fig.update_layout(
         title='1. und 2. Anlagendeckung im Zeitverlauf',
@@ -588,55 +860,29 @@ def create_coverage_ratios_chart(ticker_symbols):
 
     return fig
 
-def create_liquidity_ratios_chart(ticker_symbols):
-    balance_sheets = {}
-    fig = go.Figure()
-
-    # Farben aus der globalen Konfiguration
-    TICKER_COLORS = CONFIG['COLORS']['TICKER_COLORS']
-    company_colors = {ticker: TICKER_COLORS[i] for i, ticker in enumerate(ticker_symbols)}
-
-    # Sammle alle Jahre aus den Balance Sheets
-    all_years = set()
-    for ticker in ticker_symbols:
-        balance_sheets[ticker] = get_balance_sheet(ticker)
-        all_years.update(balance_sheets[ticker].columns)
-
-    # Sortiere die Jahre numerisch
-    sorted_years = sorted(all_years, key=lambda x: int(x))
-
-    for ticker, balance_sheet in balance_sheets.items():
-        x_values = sorted_years
-        y_values_liquidity_1 = [balance_sheet.loc['1. Liquiditätsquote', year] if year in balance_sheet.columns else None for year in x_values]
-        y_values_liquidity_2 = [balance_sheet.loc['2. Liquiditätsquote', year] if year in balance_sheet.columns else None for year in x_values]
-        y_values_liquidity_3 = [balance_sheet.loc['3. Liquiditätsquote', year] if year in balance_sheet.columns else None for year in x_values]
-
-        # 1. Liquiditätsgrad
-        fig.add_trace(go.Scatter(
+def create_liquidity_ratios_traces(ticker, balance_sheet, color, x_values):
+    # 1., 2. und 3. Liquiditätsgrad mit unterschiedlicher Linienart
+    return [
+        go.Scatter(
             x=x_values,
-            y=y_values_liquidity_1,
+            y=get_kpi_values(balance_sheet, f'{grade}. Liquiditätsquote', x_values),
             mode='lines+markers',
-            name=f'{ticker} 1. Liquiditätsgrad',
-            line=dict(color=company_colors[ticker])
-        ))
+            name=f'{ticker} {grade}. Liquiditätsgrad',
+            meta={'ticker': ticker},
+            line=dict(color=color, dash=dash)
+        )
+        for grade, dash in [(1, None), (2, 'dash'), (3, 'dot')]
+    ]
 
-        # 2. Liquiditätsgrad
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values_liquidity_2,
-            mode='lines+markers',
-            name=f'{ticker} 2. Liquiditätsgrad',
-            line=dict(color=company_colors[ticker], dash='dash')
-        ))
+def create_liquidity_ratios_chart(ticker_symbols, balance_sheets=None, colors=None):
+    balance_sheets = get_balance_sheets(ticker_symbols, balance_sheets)
+    company_colors = colors or get_ticker_colors(ticker_symbols)
+    sorted_years = get_sorted_years(balance_sheets)
+    fig = go.Figure()
 
-        # 3. Liquiditätsgrad
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values_liquidity_3,
-            mode='lines+markers',
-            name=f'{ticker} 3. Liquiditätsgrad',
-            line=dict(color=company_colors[ticker], dash='dot')
-        ))
+    for ticker, balance_sheet in balance_sheets.items():
+        for trace in create_liquidity_ratios_traces(ticker, balance_sheet, company_colors[ticker], sorted_years):
+            fig.add_trace(trace)
 
     fig.update_layout(
         title='1., 2. und 3. Liquiditätsgrade im Zeitverlauf',
@@ -647,14 +893,62 @@ def create_liquidity_ratios_chart(ticker_symbols):
 
     return fig
 
-    
+def create_dashboard_delta(symbols, added, removed, colors=None, visible_kpi=None):
+    """
+    Erstellt nur die Änderungen am Dashboard für hinzugefügte und entfernte Ticker.
+
+    Der Aufwand ist proportional zur Anzahl der geänderten Ticker und nicht zur
+    Größe der gesamten Vergleichsgruppe.
 
-def create_company_table(symbols):
-    data = get_company_info(symbols)
-    namen = [data[symbol].get('shortName', 'N/A') for symbol in data]
-    branchen = [data[symbol].get('sector', 'N/A') for symbol in data]
-    länder = [data[symbol].get('country', 'N/A') for symbol in data]
-    mitarbeiter = [data[symbol].get('fullTimeEmployees', 'N/A') for symbol in data]
+    Args:
+        symbols (list): Die vollständige neue Ticker-Liste.
+        added (list): Neu hinzugefügte Ticker.
+        removed (list): Entfernte Ticker.
+        colors (dict, optional): Farben der bereits angezeigten Ticker.
+        visible_kpi (str, optional): Aktuell im Liniendiagramm ausgewählte KPI.
+
+    Returns:
+        dict: Neue Traces je Diagramm ('add'), die entfernten Ticker ('remove', der Client löscht
+        deren Traces anhand von `meta.ticker`), Strukturbilanz-HTML je neuem Ticker, die neu
+        erstellte Unternehmenstabelle ('table'), die Farben und die KPI-Reihenfolge des Liniendiagramms.
+    """
+    colors = get_ticker_colors(symbols, colors)
+    add = {'dashboard': [], 'line-chart': [], 'coverage-ratios': [], 'liquidity-ratios': []}
+    structural_balance_sheets = {}
+
+    for ticker in added:
+        balance_sheet = get_balance_sheet(ticker)
+        years = sorted(balance_sheet.columns, key=lambda x: int(x))
+        add['dashboard'] += create_dashboard_traces(ticker, balance_sheet, colors[ticker], show_legend=False)
+        add['line-chart'] += create_line_chart_traces(ticker, balance_sheet, colors[ticker], years, visible_kpi)
+        add['coverage-ratios'] += create_coverage_ratios_traces(ticker, balance_sheet, colors[ticker], years)
+        add['liquidity-ratios'] += create_liquidity_ratios_traces(ticker, balance_sheet, colors[ticker], years)
+        structural_balance_sheets[ticker] = create_structural_balance_sheet_table([ticker])
+
+    # Nur neue Ticker abfragen; für die übrigen die bereits gespeicherten Datensätze verwenden
+    company_info = {
+        ticker: load_company_info(ticker) if ticker in added else get_stored_company_info(ticker)
+        for ticker in symbols
+    }
+
+    return {
+        'add': {name: [trace.to_plotly_json() for trace in traces] for name, traces in add.items()},
+        'remove': list(removed),
+        'structural_balance_sheets': structural_balance_sheets,
+        'table': json.loads(create_company_table(symbols, company_info).to_json()),
+        'colors': {ticker: colors[ticker] for ticker in symbols},
+        'line_chart_kpis': [label for _, label in LINE_CHART_KPIS]
+    }
+
+def create_company_table(symbols, company_info=None):
+    if company_info is None:
+        data = get_company_info(symbols)
+    else:
+        data = {symbol: company_info[symbol] for symbol in symbols}
+    namen = [data[symbol].short_name or 'N/A' for symbol in data]
+    branchen = [data[symbol].sector or 'N/A' for symbol in data]
+    länder = [data[symbol].country or 'N/A' for symbol in data]
+    mitarbeiter = [data[symbol].full_time_employees if data[symbol].full_time_employees is not None else 'N/A' for symbol in data]
 
     # Anzahl der Zeilen berechnen
     row_count = len(namen)
@@ -678,6 +972,135 @@ def create_company_table(symbols):
     )
     return fig
 
+def format_sse(event, data):
+    """
+    Formatiert eine Nachricht im Server-Sent-Events-Format.
+
+    Args:
+        event (str): Der Ereignistyp.
+        data (str): Die Nutzdaten als JSON-String.
+
+    Returns:
+        str: Die formatierte SSE-Nachricht.
+    """
+    return f"event: {event}\ndata: {data}\n\n"
+
+class DashboardBuild:
+    """
+    Ein laufender Dashboard-Aufbau für eine Ticker-Auswahl.
+
+    Alle Ereignisse werden gesammelt, damit später verbundene Clients (z.B. bei doppeltem
+    Absenden) den bisherigen Verlauf erhalten und sich an den laufenden Aufbau anhängen.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.events = []
+        self.finished = False
+        self.condition = threading.Condition()
+
+    def emit(self, event, data):
+        with self.condition:
+            self.events.append(format_sse(event, data))
+            self.condition.notify_all()
+
+    def finish(self):
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+    def stream(self):
+        """
+        Liefert alle bisherigen und zukünftigen Ereignisse bis zum Ende des Aufbaus.
+
+        Yields:
+            str: SSE-Nachrichten.
+        """
+        index = 0
+        while True:
+            with self.condition:
+                while index >= len(self.events) and not self.finished:
+                    # Kommentarzeile als Keep-Alive, falls ein Schritt länger dauert
+                    if not self.condition.wait(timeout=15):
+                        break
+                pending = self.events[index:]
+                index = len(self.events)
+                done = self.finished and not pending
+            if done:
+                return
+            if pending:
+                yield ''.join(pending)
+            else:
+                yield ": keep-alive\n\n"
+
+# Laufende Dashboard-Aufbauten, Schlüssel ist die Ticker-Auswahl in Reihenfolge
+DASHBOARD_BUILDS = {}
+DASHBOARD_BUILDS_LOCK = threading.Lock()
+
+def run_dashboard_build(build):
+    """
+    Baut das Dashboard schrittweise auf und meldet jeden fertigen Schritt als Ereignis.
+
+    Args:
+        build (DashboardBuild): Der zu bearbeitende Aufbau.
+    """
+    symbols = build.symbols
+    try:
+        company_info = {}
+        for ticker in symbols:
+            company_info[ticker] = load_company_info(ticker)
+            build.emit('progress', json.dumps({'ticker': ticker, 'step': 'fetch'}))
+        table = create_company_table(symbols, company_info)
+        build.emit('figure', json.dumps({'name': 'table', 'figure': json.loads(table.to_json())}))
+
+        for ticker in symbols:
+            get_balance_sheet(ticker)
+            build.emit('progress', json.dumps({'ticker': ticker, 'step': 'kpis'}))
+            build.emit('structural_balance_sheet', json.dumps({'ticker': ticker, 'html': create_structural_balance_sheet_table([ticker])}))
+
+        charts = {
+            'dashboard': create_dashboard,
+            'line-chart': create_line_chart,
+            'coverage-ratios': create_coverage_ratios_chart,
+            'liquidity-ratios': create_liquidity_ratios_chart
+        }
+        for name, create_chart in charts.items():
+            fig = create_chart(symbols)
+            build.emit('figure', json.dumps({'name': name, 'figure': json.loads(fig.to_json())}))
+            build.emit('progress', json.dumps({'step': 'chart', 'name': name}))
+
+        build.emit('done', json.dumps({'symbols': symbols, 'colors': get_ticker_colors(symbols)}))
+    except Exception as e:
+        print(f"Fehler beim Erstellen des Dashboards: {e}")
+        build.emit('build_error', json.dumps({'error': "Fehler beim Erstellen des Dashboards"}))
+    finally:
+        with DASHBOARD_BUILDS_LOCK:
+            DASHBOARD_BUILDS.pop(frozenset(symbols), None)
+        build.finish()
+
+def get_or_start_dashboard_build(symbols):
+    """
+    Gibt den laufenden Aufbau für die Ticker-Auswahl zurück oder startet einen neuen.
+
+    Die Reihenfolge der Ticker spielt für die Zuordnung keine Rolle. Ein Client, der sich
+    an einen laufenden Aufbau anhängt, erhält Reihenfolge und Farben dieses Aufbaus
+    (über das 'done'-Ereignis), sodass Diagramme und Delta-Updates zusammenpassen.
+
+    Args:
+        symbols (list): Liste der Ticker-Symbole.
+
+    Returns:
+        DashboardBuild: Der (ggf. bereits laufende) Aufbau.
+    """
+    key = frozenset(symbols)
+    with DASHBOARD_BUILDS_LOCK:
+        build = DASHBOARD_BUILDS.get(key)
+        if build is None:
+            build = DashboardBuild(symbols)
+            DASHBOARD_BUILDS[key] = build
+            threading.Thread(target=run_dashboard_build, args=(build,), daemon=True).start()
+    return build
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -689,10 +1112,10 @@ def get_tickers():
         return jsonify([])
 
     try:
-        tickers = yf.Ticker(query)
+        company_info = load_company_info(query)
         # Beispiel: Rückgabe von Name und Symbol
         return jsonify([
-            {"symbol": query, "name": tickers.info.get("shortName", "Unbekannt")}
+            {"symbol": query, "name": company_info.short_name or "Unbekannt"}
         ])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -766,6 +1189,34 @@ def update_liquidity_ratios_chart():
     fig = create_liquidity_ratios_chart(symbols)
     return jsonify(fig.to_json())
 
+@app.route('/dashboard_events', methods=['GET'])
+def dashboard_events():
+    symbols = [symbol.strip().upper() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+    if not symbols:
+        return jsonify({"error": "Keine Symbole angegeben"}), 400
+
+    build = get_or_start_dashboard_build(symbols)
+    return Response(
+        stream_with_context(build.stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/update_dashboard_delta', methods=['POST'])
+def update_dashboard_delta():
+    symbols = request.json.get('symbols', [])
+    added = [ticker for ticker in request.json.get('added', []) if ticker in symbols]
+    removed = [ticker for ticker in request.json.get('removed', []) if ticker not in symbols]
+    if not symbols:
+        return jsonify({"error": "Keine Symbole angegeben"}), 400
+
+    try:
+        delta = create_dashboard_delta(symbols, added, removed, request.json.get('colors'), request.json.get('visible_kpi'))
+        return app.response_class(json.dumps(delta, cls=plotly.utils.PlotlyJSONEncoder), mimetype='application/json')
+    except Exception as e:
+        print(f"Fehler beim Erstellen des Dashboard-Deltas: {e}")
+        return jsonify({"error": "Fehler beim Aktualisieren des Dashboards"}), 500
+
 @app.route('/check_ticker', methods=['POST'])
 def check_ticker():
     ticker = request.json.get('ticker', '')
@@ -775,8 +1226,8 @@ def check_ticker():
 @app.route('/validate_ticker/<ticker>', methods=['GET'])
 def validate_ticker(ticker):
     try:
-        ticker_info = yf.Ticker(ticker).info
-        return jsonify({"isValid": bool(ticker_info)})
+        company_info = load_company_info(ticker.upper())
+        return jsonify({"isValid": company_info.short_name is not None})
     except Exception:
         return jsonify({"isValid": False})
 
@@ -0,0 +1,102 @@
+"""
+Gemeinsame Bausteine der Batch-Werkzeuge (reports.py, batch_kpis.py).
+
+- Einlesen der Ticker-Dateien (eine Zeile pro Eintrag, '#' für Kommentare)
+- Erledigt-Markierungen, mit denen abgebrochene Läufe fortgesetzt werden
+- Prozesspool mit begrenzter Anzahl gleichzeitig eingereichter Aufträge
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+DONE_MARKER = '.done'
+
+
+def read_symbol_lines(path):
+    """
+    Liest eine Ticker-Datei zeilenweise.
+
+    Eine Zeile enthält ein Symbol oder mehrere, durch Komma getrennte Symbole; alles
+    nach '#' ist Kommentar. Leere Zeilen werden übersprungen.
+
+    Args:
+        path (str): Pfad zur Eingabedatei.
+
+    Returns:
+        list: Eine Liste der Ticker-Symbole (in Großbuchstaben) pro Zeile.
+    """
+    lines = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            symbols = [symbol.strip().upper() for symbol in line.split('#', 1)[0].split(',') if symbol.strip()]
+            if symbols:
+                lines.append(symbols)
+    return lines
+
+
+def read_marker(path):
+    """
+    Liest eine Erledigt-Markierung.
+
+    Args:
+        path (str): Pfad der Markierung.
+
+    Returns:
+        set: Die eingetragenen Zeilen (z.B. erzeugte Formate) oder None, wenn es keine Markierung gibt.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def write_marker(path, entries=()):
+    """
+    Schreibt eine Erledigt-Markierung (ein Eintrag pro Zeile).
+
+    Die Datei wird temporär geschrieben und dann umbenannt, sodass eine Markierung
+    entweder vollständig oder gar nicht vorhanden ist.
+
+    Args:
+        path (str): Pfad der Markierung.
+        entries (iterable): Einzutragende Zeilen.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{entry}\n" for entry in sorted(entries)))
+    os.replace(tmp_path, path)
+
+
+def run_in_pool(function, jobs, workers=None, max_tasks_per_child=None, initializer=None):
+    """
+    Führt `function(*job)` für alle Aufträge in einem Prozesspool aus.
+
+    Es sind nie mehr als 2 * workers Aufträge gleichzeitig eingereicht, sodass auch
+    bei sehr großen Läufen nur wenige Aufträge und Ergebnisse im Speicher liegen.
+
+    Args:
+        function (callable): Auf Modulebene definierte Funktion, die im Worker läuft.
+        jobs (iterable): Argument-Tupel, eines pro Auftrag.
+        workers (int, optional): Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+        max_tasks_per_child (int, optional): Aufträge pro Worker, bevor dieser neu gestartet wird.
+        initializer (callable, optional): Wird beim Start jedes Workers aufgerufen.
+
+    Yields:
+        Das Ergebnis jedes Auftrags, in der Reihenfolge der Fertigstellung.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=max_tasks_per_child,
+                             initializer=initializer) as executor:
+        queue = iter(jobs)
+        in_flight = set()
+        while True:
+            while len(in_flight) < 2 * workers:
+                job = next(queue, None)
+                if job is None:
+                    break
+                in_flight.add(executor.submit(function, *job))
+            if not in_flight:
+                break
+
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
@@ -0,0 +1,179 @@
+"""
+Batch-Berechnung der Bilanzkennzahlen für große Ticker-Listen ohne Webserver.
+
+Für jeden Ticker der Eingabedatei läuft dieselbe Pipeline wie im Dashboard
+(get_filtered_balance_sheet -> clean_and_skip_nan -> convert_dataframe_to_euro ->
+calculate_kpis -> translate_indices). Die Ticker werden auf alle CPU-Kerne verteilt,
+jedes Ergebnis wird sofort im lokalen Datenspeicher der Anwendung abgelegt (derselbe,
+den `reports.py --offline` liest) und im Checkpoint-Verzeichnis des Laufs als erledigt
+markiert. Jeder Lauf hat ein eigenes Checkpoint-Verzeichnis (Standard: Lauf-ID = heutiges
+Datum), sodass ein nächtlicher Lauf alle Ticker neu berechnet, ein abgebrochener Lauf mit
+derselben Lauf-ID aber bereits berechnete Ticker überspringt.
+
+Am Ende entsteht eine gemeinsame Ergebnisdatei (eine Zeile pro Ticker und Jahr, eine
+Spalte pro Kennzahl) sowie ein Fehlerbericht mit allen fehlgeschlagenen Tickern.
+
+Beispiel:
+    python batch_kpis.py universe.txt --output kpis.parquet --checkpoint-dir checkpoints
+    python batch_kpis.py universe.txt --run-id 2025-06-01   # abgebrochenen Lauf fortsetzen
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import pandas as pd
+
+from app import get_balance_sheet, load_from_data_store, save_to_data_store
+from batch_common import DONE_MARKER, read_marker, read_symbol_lines, run_in_pool, write_marker
+
+
+def read_tickers(path):
+    """
+    Liest das Ticker-Universum aus einer Textdatei.
+
+    Anders als bei den Berichten zählt hier jedes Symbol einzeln, auch wenn eine Zeile
+    mehrere kommagetrennte Symbole enthält.
+
+    Args:
+        path (str): Pfad zur Eingabedatei (ein Symbol pro Zeile, '#' für Kommentare).
+
+    Returns:
+        list: Die Ticker-Symbole ohne Duplikate, in Dateireihenfolge.
+    """
+    return list(dict.fromkeys(symbol for symbols in read_symbol_lines(path) for symbol in symbols))
+
+
+def get_checkpoint_path(checkpoint_dir, ticker_symbol):
+    return os.path.join(checkpoint_dir, f"{ticker_symbol}{DONE_MARKER}")
+
+
+def process_ticker(ticker_symbol, checkpoint_dir):
+    """
+    Berechnet die Kennzahlen eines Tickers, speichert sie im Datenspeicher und markiert sie als erledigt.
+
+    Schlägt die Pipeline fehl (z.B. unbekanntes Symbol oder fehlende Bilanzposition),
+    wird keine Markierung geschrieben: Die Meldung landet im Fehlerbericht, und der
+    Ticker wird beim Fortsetzen desselben Laufs erneut versucht.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+        checkpoint_dir (str): Checkpoint-Verzeichnis des Laufs.
+
+    Returns:
+        tuple: (Ticker-Symbol, Fehlermeldung oder None)
+    """
+    try:
+        save_to_data_store(ticker_symbol, get_balance_sheet(ticker_symbol))
+        write_marker(get_checkpoint_path(checkpoint_dir, ticker_symbol))
+        return ticker_symbol, None
+    except Exception as e:
+        return ticker_symbol, f"{type(e).__name__}: {e}"
+
+
+def run_batch(tickers, checkpoint_dir, workers=None):
+    """
+    Berechnet die Kennzahlen aller im Lauf noch nicht erledigten Ticker im Prozesspool.
+
+    Args:
+        tickers (list): Liste der Ticker-Symbole.
+        checkpoint_dir (str): Checkpoint-Verzeichnis des Laufs.
+        workers (int, optional): Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+
+    Returns:
+        dict: Fehlermeldung je fehlgeschlagenem Ticker.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    pending = [t for t in tickers if read_marker(get_checkpoint_path(checkpoint_dir, t)) is None]
+    print(f"{len(tickers) - len(pending)} Ticker bereits berechnet, {len(pending)} ausstehend")
+
+    errors = {}
+    results = run_in_pool(process_ticker, ((ticker, checkpoint_dir) for ticker in pending), workers)
+    for done, (ticker_symbol, error) in enumerate(results, start=1):
+        if error:
+            errors[ticker_symbol] = error
+            print(f"[{done}/{len(pending)}] Fehler bei {ticker_symbol}: {error}")
+        else:
+            print(f"[{done}/{len(pending)}] {ticker_symbol} berechnet")
+    return errors
+
+
+def to_rows(ticker_symbol, balance_sheet):
+    """
+    Formt die Bilanzdaten eines Tickers in eine Zeile pro Jahr und eine Spalte pro Kennzahl um.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+        balance_sheet (pd.DataFrame): Die aufbereiteten Bilanzdaten (Kennzahlen x Jahre).
+
+    Returns:
+        pd.DataFrame: Die Zeilen mit den Spalten 'Ticker', 'Jahr' und den Kennzahlen.
+    """
+    result = balance_sheet.T
+    result.index.name = 'Jahr'
+    result = result.reset_index()
+    result.insert(0, 'Ticker', ticker_symbol)
+    return result
+
+
+def write_results(tickers, checkpoint_dir, output_path):
+    """
+    Fasst die Daten aller erledigten Ticker aus dem Datenspeicher zu einer Ergebnisdatei zusammen.
+
+    Args:
+        tickers (list): Liste der Ticker-Symbole.
+        checkpoint_dir (str): Checkpoint-Verzeichnis des Laufs.
+        output_path (str): Zieldatei (.parquet oder .csv).
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen.
+    """
+    frames = []
+    for ticker_symbol in tickers:
+        if read_marker(get_checkpoint_path(checkpoint_dir, ticker_symbol)) is None:
+            continue
+        stored = load_from_data_store(ticker_symbol)
+        if stored is not None:
+            frames.append(to_rows(ticker_symbol, stored['balance_sheet']))
+
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Ticker', 'Jahr'])
+    if output_path.endswith('.csv'):
+        result.to_csv(output_path, index=False)
+    else:
+        result.to_parquet(output_path, index=False)
+    return len(result)
+
+
+def write_error_report(errors, path):
+    report = pd.DataFrame(sorted(errors.items()), columns=['Ticker', 'Fehler'])
+    report.to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Berechnet Bilanzkennzahlen für eine Ticker-Liste ohne Webserver.")
+    parser.add_argument('input', help="Textdatei mit einem Ticker-Symbol pro Zeile")
+    parser.add_argument('--output', default='kpis.parquet', help="Ergebnisdatei (.parquet oder .csv)")
+    parser.add_argument('--errors', default='kpis_fehler.csv', help="Fehlerbericht als CSV")
+    parser.add_argument('--checkpoint-dir', default='kpi_checkpoints',
+                        help="Basisverzeichnis für Erledigt-Markierungen (ein Unterverzeichnis pro Lauf)")
+    parser.add_argument('--run-id', default=date.today().isoformat(),
+                        help="Lauf-ID (Standard: heutiges Datum); bereits berechnete Ticker dieses Laufs "
+                             "werden übersprungen")
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl der Worker-Prozesse")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    checkpoint_dir = os.path.join(args.checkpoint_dir, args.run_id)
+    tickers = read_tickers(args.input)
+    errors = run_batch(tickers, checkpoint_dir, args.workers)
+    rows = write_results(tickers, checkpoint_dir, args.output)
+    write_error_report(errors, args.errors)
+
+    print(f"{rows} Zeilen nach {args.output} geschrieben, {len(errors)} Fehler nach {args.errors} "
+          f"({time.perf_counter() - start:.1f} s)")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Zählt die HTTP-Anfragen und TCP-Verbindungen eines kalten Dashboard-Aufbaus gegen einen
+lokalen Ersatzserver.
+
+Alle yfinance-Anfragen werden über eine Session auf einen lokalen HTTP-Server umgeleitet,
+der die benötigten Yahoo-Endpunkte (Cookie, Crumb, quoteSummary, Quote, Fundamentals-
+Zeitreihen, Kurshistorie) mit synthetischen Daten beantwortet und jede Anfrage sowie
+jede neue Verbindung zählt.
+
+Verglichen werden:
+- "vorher": ein frisches yf.Ticker-Objekt je Verbraucher (Ticker-Prüfung, Tabelle,
+  Bilanz, Wechselkurs pro Ticker), wie vor der Einführung der gemeinsamen Session.
+- "nachher": der aktuelle Aufbau über die gemeinsame curl_cffi-Session der Anwendung.
+  Autovervollständigung und Ticker-Prüfung laufen wie in Flask im Anfrage-Thread, der
+  Dashboard-Aufbau in einem eigenen Thread. Da curl_cffi pro Thread ein eigenes
+  curl-Handle verwendet, werden Verbindungen nur innerhalb eines Threads wiederverwendet.
+
+Beispiel:
+    python bench_http_requests.py AAPL MSFT GOOGL
+"""
+import argparse
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from curl_cffi import requests as curl_requests
+
+BALANCE_SHEET_VALUES = {
+    'TotalNonCurrentAssets': 250e9, 'CurrentAssets': 150e9, 'Inventory': 7e9, 'Receivables': 60e9,
+    'CashCashEquivalentsAndShortTermInvestments': 65e9, 'StockholdersEquity': 60e9,
+    'TotalLiabilitiesNetMinorityInterest': 290e9, 'CurrentLiabilities': 145e9,
+    'TotalNonCurrentLiabilitiesNetMinorityInterest': 145e9, 'NetIncome': 95e9,
+}
+YEARS = ['2021', '2022', '2023', '2024']
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Beantwortet die von yfinance verwendeten Yahoo-Endpunkte mit synthetischen Daten."""
+
+    protocol_version = 'HTTP/1.1'
+    counter = Counter()
+    connections = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            StandInHandler.connections += 1
+
+    def do_GET(self):
+        host, _, path = self.path.lstrip('/').partition('/')
+        parts = urlsplit('/' + path)
+        params = parse_qs(parts.query)
+        with self.lock:
+            self.counter[f"{host}{parts.path.rsplit('/', 1)[0]}"] += 1
+
+        if host == 'fc.yahoo.com':
+            self.reply('')
+        elif parts.path.endswith('/getcrumb'):
+            self.reply('standin-crumb', 'text/plain')
+        elif '/quoteSummary/' in parts.path:
+            symbol = parts.path.rsplit('/', 1)[1]
+            self.reply(json.dumps({'quoteSummary': {'result': [{
+                'quoteType': {'symbol': symbol, 'shortName': f"{symbol} Inc.", 'quoteType': 'EQUITY'},
+                'assetProfile': {'sector': 'Technology', 'country': 'United States', 'fullTimeEmployees': 1000},
+            }], 'error': None}}))
+        elif parts.path.endswith('/quote'):
+            symbol = params.get('symbols', [''])[0]
+            self.reply(json.dumps({'quoteResponse': {'result': [{'symbol': symbol, 'shortName': f"{symbol} Inc."}],
+                                                     'error': None}}))
+        elif '/timeseries/' in parts.path:
+            self.reply(json.dumps({'timeseries': {'result': self.timeseries(params), 'error': None}}))
+        elif '/chart/' in parts.path:
+            self.reply(json.dumps(self.chart(parts.path.rsplit('/', 1)[1])))
+        else:
+            self.reply('{}')
+
+    def reply(self, body, content_type='application/json'):
+        data = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def timeseries(params):
+        timestamps = [int(time.mktime(time.strptime(f"{year}-12-31", '%Y-%m-%d'))) for year in YEARS]
+        result = []
+        for key in params.get('type', [''])[0].split(','):
+            name = key.removeprefix('annual').removeprefix('quarterly').removeprefix('trailing')
+            result.append({
+                'meta': {'type': [key]},
+                'timestamp': timestamps,
+                key: [{'asOfDate': f"{year}-12-31", 'reportedValue': {'raw': BALANCE_SHEET_VALUES.get(name, 1e9)}}
+                      for year in YEARS],
+            })
+        return result
+
+    @staticmethod
+    def chart(symbol):
+        now = int(time.time())
+        return {'chart': {'result': [{
+            'meta': {'currency': 'EUR', 'symbol': symbol, 'exchangeName': 'CCY', 'instrumentType': 'CURRENCY',
+                     'exchangeTimezoneName': 'Europe/London', 'timezone': 'BST', 'gmtoffset': 0,
+                     'regularMarketTime': now, 'dataGranularity': '1d', 'range': '1d', 'priceHint': 4,
+                     'validRanges': ['1d', '5d'], 'currentTradingPeriod': {
+                         'regular': {'start': now - 3600, 'end': now + 3600, 'timezone': 'BST', 'gmtoffset': 0}}},
+            'timestamp': [now],
+            'indicators': {'quote': [{'open': [0.9], 'high': [0.9], 'low': [0.9], 'close': [0.9], 'volume': [0]}],
+                           'adjclose': [{'adjclose': [0.9]}]},
+        }], 'error': None}}
+
+
+class StandInSession(curl_requests.Session):
+    """
+    Leitet alle Anfragen an den lokalen Ersatzserver um (Host wird Teil des Pfads).
+
+    Verwendet dieselbe curl_cffi-Session wie die Anwendung, damit die gezählten
+    Verbindungen dem echten Verhalten (ein curl-Handle pro Thread) entsprechen.
+    """
+
+    def __init__(self, base_url):
+        super().__init__(impersonate='chrome')
+        self.base_url = base_url
+
+    def request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ''
+        response = super().request(method, f"{self.base_url}/{parts.netloc}{parts.path}{query}", *args, **kwargs)
+        if parts.netloc == 'fc.yahoo.com':
+            # yfinance erkennt das Cookie nur unter einer Yahoo-Domain und mit Ablaufdatum
+            self.cookies.set('A3', 'standin', domain='.yahoo.com', path='/')
+            for cookie in self.cookies.jar:
+                cookie.expires = int(time.time()) + 86400
+        return response
+
+
+def legacy_cold_dashboard(symbols, session):
+    """Aufrufmuster vor der gemeinsamen Session: ein frisches yf.Ticker-Objekt pro Verbraucher."""
+    import yfinance as yf
+    yf.Ticker('USDEUR=X', session=session)
+    for symbol in symbols:
+        yf.Ticker(symbol).info                      # /api/tickers (Autovervollständigung)
+        yf.Ticker(symbol).balancesheet              # /check_ticker
+    for symbol in symbols:
+        yf.Ticker(symbol).info                      # /update_table
+    for symbol in symbols:
+        yf.Ticker(symbol).balancesheet              # get_filtered_balance_sheet
+        yf.Ticker('USDEUR=X').history(period='1d')  # Wechselkurs pro Ticker
+
+
+def current_cold_dashboard(symbols, session):
+    """Aktuelles Aufrufmuster über die gemeinsame Session (Aufbau in eigenem Thread wie in Flask)."""
+    import app
+    app.HTTP_SESSION = session
+    app.CONFIG['DATA_STORE_DIR'] = tempfile.mkdtemp(prefix='standin-data-store-')
+    for symbol in symbols:
+        app.load_company_info(symbol)
+        app.is_valid_ticker(symbol)
+    build = app.DashboardBuild(symbols)
+    thread = threading.Thread(target=app.run_dashboard_build, args=(build,))
+    thread.start()
+    thread.join()
+    if any(event.startswith('event: build_error') for event in build.events):
+        raise RuntimeError("Dashboard-Aufbau gegen den Ersatzserver fehlgeschlagen")
+
+
+def run_scenario(name, symbols, results):
+    """Startet Ersatzserver und Szenario in einem frischen Prozess (kalte Caches)."""
+    StandInHandler.counter.clear()
+    StandInHandler.connections = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = StandInSession(f"http://127.0.0.1:{server.server_port}")
+
+    import yfinance as yf
+    yf.config.debug.hide_exceptions = False
+    # Eigenes Cache-Verzeichnis, damit das Ersatz-Cookie nicht im echten yfinance-Cache landet
+    yf.set_tz_cache_location(tempfile.mkdtemp(prefix='standin-yf-cache-'))
+    scenario = legacy_cold_dashboard if name == 'vorher' else current_cold_dashboard
+    scenario(symbols, session)
+    server.shutdown()
+    results[name] = (dict(StandInHandler.counter), StandInHandler.connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zählt HTTP-Anfragen und Verbindungen pro kaltem Dashboard-Aufbau.")
+    parser.add_argument('symbols', nargs='*', default=['AAPL', 'MSFT', 'GOOGL'])
+    args = parser.parse_args()
+
+    manager = multiprocessing.Manager()
+    results = manager.dict()
+    for name in ['vorher', 'nachher']:
+        process = multiprocessing.Process(target=run_scenario, args=(name, args.symbols, results))
+        process.start()
+        process.join()
+
+    for name in ['vorher', 'nachher']:
+        counts, connections = results.get(name, ({}, 0))
+        print(f"{name}: {sum(counts.values())} HTTP-Anfragen über {connections} Verbindungen "
+              f"für {len(args.symbols)} Ticker")
+        for endpoint, count in sorted(counts.items()):
+            print(f"    {count:4d}  {endpoint}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Speicher-Benchmark: vollständige yfinance-`.info`-Dicts vs. kompakte CompanyInfo-Datensätze.
+
+Erzeugt synthetische `.info`-Dicts in realistischer Größe (über 100 Schlüssel inkl.
+langer Unternehmensbeschreibung) und misst mit tracemalloc, wie viel Speicher nach
+dem Laden von N Unternehmen belegt bleibt.
+
+Beispiel:
+    python bench_metadata_memory.py --companies 10000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from app import CompanyInfo
+
+
+def make_info(index):
+    """
+    Erzeugt ein synthetisches `.info`-Dict, das in Aufbau und Größe einem echten entspricht.
+
+    Args:
+        index (int): Laufende Nummer des Unternehmens.
+
+    Returns:
+        dict: Das synthetische `.info`-Dict.
+    """
+    info = {
+        'shortName': f"Company {index} Inc.",
+        'longName': f"Company Number {index} Incorporated",
+        'sector': 'Technology',
+        'industry': 'Consumer Electronics',
+        'country': 'United States',
+        'city': 'Cupertino',
+        'address1': f"{index} Infinite Loop",
+        'website': f"https://www.company{index}.com",
+        'fullTimeEmployees': 1000 + index,
+        'longBusinessSummary': f"Company {index} designs, manufactures and markets products worldwide. " * 15,
+        'companyOfficers': [
+            {'name': f"Officer {index}-{j}", 'title': 'Director', 'age': 50 + j, 'totalPay': 1_000_000 * j}
+            for j in range(10)
+        ],
+    }
+    for key in range(110):
+        info[f"metric{key}"] = float(index * key) + 0.5
+    return info
+
+
+def measure(factory, count):
+    """
+    Misst den nach dem Erzeugen von `count` Objekten belegten Speicher.
+
+    Args:
+        factory (callable): Erzeugt aus einem Index das zu haltende Objekt.
+        count (int): Anzahl der Unternehmen.
+
+    Returns:
+        int: Belegter Speicher in Bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(index) for index in range(count)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht den Speicherbedarf von `.info`-Dicts und CompanyInfo.")
+    parser.add_argument('--companies', type=int, default=10000, help="Anzahl der Unternehmen")
+    args = parser.parse_args()
+
+    full = measure(make_info, args.companies)
+    compact = measure(lambda index: CompanyInfo.from_info(f"T{index}", make_info(index)), args.companies)
+
+    print(f"Unternehmen:             {args.companies}")
+    print(f"Vollständige .info-Dicts: {full / 1024 / 1024:8.1f} MiB ({full / args.companies:,.0f} B/Unternehmen)")
+    print(f"CompanyInfo-Datensätze:   {compact / 1024 / 1024:8.1f} MiB ({compact / args.companies:,.0f} B/Unternehmen)")
+    print(f"Faktor:                   {full / compact:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Laufzeit-Benchmark für die Batch-Berichte mit synthetischen Unternehmen.
+
+Legt N synthetische Unternehmen (Bilanzdaten und Unternehmensinformationen) im lokalen
+Datenspeicher an, erzeugt dafür N Berichte im Offline-Modus über reports.run_batch
+(inklusive Kaleido-Rendering) und misst die Gesamtdauer. Die synthetischen Einträge
+werden danach wieder aus dem Datenspeicher entfernt.
+
+Die Bilanzdaten durchlaufen dieselbe Aufbereitung wie echte Daten (clean_and_skip_nan ->
+calculate_kpis -> translate_indices); nur die Euro-Umrechnung entfällt, da sie einen
+Netzabruf erfordert.
+
+Beispiel:
+    python bench_reports.py --reports 1000 --formats pdf
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from app import (
+    CompanyInfo,
+    calculate_kpis,
+    clean_and_skip_nan,
+    get_company_info_path,
+    get_data_store_path,
+    save_company_info,
+    save_to_data_store,
+    translate_indices,
+)
+from reports import run_batch
+
+SYMBOL_PREFIX = 'SYN'
+INDICES = [
+    'Total Non Current Assets', 'Current Assets', 'Inventory', 'Receivables',
+    'Cash Cash Equivalents And Short Term Investments', 'Stockholders Equity',
+    'Total Liabilities Net Minority Interest', 'Current Liabilities',
+    'Total Non Current Liabilities Net Minority Interest', 'Net Income'
+]
+YEARS = ['2021', '2022', '2023', '2024']
+
+
+def seed_companies(count, seed=0):
+    """
+    Legt synthetische Unternehmen im lokalen Datenspeicher an.
+
+    Args:
+        count (int): Anzahl der Unternehmen.
+        seed (int): Startwert des Zufallsgenerators (gleiche Daten bei jedem Lauf).
+
+    Returns:
+        list: Die Ticker-Symbole der angelegten Unternehmen.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = []
+    for index in range(count):
+        symbol = f"{SYMBOL_PREFIX}{index:05d}"
+        raw = pd.DataFrame(rng.uniform(1e8, 1e11, (len(INDICES), len(YEARS))), index=INDICES, columns=YEARS)
+        save_to_data_store(symbol, translate_indices(calculate_kpis(clean_and_skip_nan(raw))))
+
+        save_company_info(CompanyInfo(symbol=symbol, short_name=f"Synthetic {index} AG", sector='Technology',
+                                      country='Germany', full_time_employees=1000 + index))
+        symbols.append(symbol)
+    return symbols
+
+
+def remove_companies(symbols):
+    for symbol in symbols:
+        for path in (get_data_store_path(symbol), get_company_info_path(symbol)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Misst die Dauer von N Offline-Berichten mit synthetischen Daten.")
+    parser.add_argument('--reports', type=int, default=1000, help="Anzahl der Berichte")
+    parser.add_argument('--group-size', type=int, default=1, help="Ticker pro Bericht (Vergleichsgruppe)")
+    parser.add_argument('--formats', nargs='+', default=['pdf'], choices=['png', 'pdf', 'svg', 'jpeg'])
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl der Worker-Prozesse")
+    parser.add_argument('--max-tasks-per-child', type=int, default=50)
+    args = parser.parse_args()
+
+    symbols = seed_companies(args.reports * args.group_size)
+    groups = [symbols[i:i + args.group_size] for i in range(0, len(symbols), args.group_size)]
+    output_dir = tempfile.mkdtemp(prefix='bench-reports-')
+    try:
+        summary = run_batch(groups, output_dir, args.formats, args.workers, args.max_tasks_per_child, offline=True)
+    finally:
+        remove_companies(symbols)
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    print(f"Berichte:     {summary['done']} erstellt, {len(summary['errors'])} Fehler")
+    print(f"Formate:      {', '.join(args.formats)}")
+    print(f"Worker:       {args.workers or os.cpu_count()}")
+    print(f"Gesamtdauer:  {summary['elapsed']:.1f} s ({summary['elapsed'] / max(len(groups), 1):.3f} s/Bericht)")
+
+
+if __name__ == '__main__':
+    main()
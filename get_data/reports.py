@@ -0,0 +1,338 @@
+"""
+Batch-Erzeugung statischer Berichte (PNG/PDF) für viele Unternehmen.
+
+Jede Zeile der Eingabedatei beschreibt einen Bericht: ein einzelnes Ticker-Symbol
+(Bericht pro Unternehmen) oder mehrere, durch Komma getrennte Symbole
+(Bericht pro Vergleichsgruppe). Für jeden Bericht werden dieselben Abbildungen wie
+im Dashboard erzeugt und mit Plotly/Kaleido gespeichert: als PDF eine Datei pro Bericht
+(eine Seite pro Abbildung), in den Bildformaten eine Datei pro Abbildung.
+
+Jeder Worker-Prozess startet einmalig einen Kaleido-Server (ein Chrome-Prozess), der
+für alle Berichte des Workers wiederverwendet wird.
+
+Beispiel:
+    python reports.py tickers.txt --output-dir reports --formats png pdf --offline
+
+Berichte, die bereits in allen angeforderten Formaten vorliegen, werden bei einem
+erneuten Lauf übersprungen, sodass abgebrochene Läufe einfach fortgesetzt werden
+können; fehlende Formate werden nachträglich erzeugt.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+from multiprocessing.util import Finalize
+
+import kaleido
+import plotly.graph_objects as go
+import plotly.io as pio
+from pypdf import PdfWriter
+
+from app import (
+    CONFIG,
+    CompanyInfo,
+    create_company_table,
+    create_coverage_ratios_chart,
+    create_dashboard,
+    create_line_chart,
+    create_liquidity_ratios_chart,
+    get_balance_sheet,
+    get_structural_balance_sheet_rows,
+    load_company_info,
+    load_from_data_store,
+    save_to_data_store,
+)
+from batch_common import DONE_MARKER, read_marker, read_symbol_lines, run_in_pool, write_marker
+
+
+def read_report_groups(path):
+    """
+    Liest die Berichtsdefinitionen aus einer Textdatei.
+
+    Args:
+        path (str): Pfad zur Eingabedatei (eine Zeile pro Bericht, '#' für Kommentare).
+
+    Returns:
+        list: Liste von Ticker-Listen, eine pro Bericht.
+    """
+    return read_symbol_lines(path)
+
+
+def get_report_name(symbols):
+    return '_'.join(symbols)
+
+
+def get_done_marker_path(output_dir, symbols):
+    return os.path.join(output_dir, get_report_name(symbols), DONE_MARKER)
+
+
+def get_rendered_formats(output_dir, symbols):
+    """
+    Liest die Formate, in denen ein Bericht bereits vollständig erzeugt wurde.
+
+    Der Marker enthält ein Format pro Zeile und wird erst nach dem Rendern geschrieben.
+
+    Args:
+        output_dir (str): Zielverzeichnis für alle Berichte.
+        symbols (list): Ticker-Symbole des Berichts.
+
+    Returns:
+        set: Die bereits erzeugten Formate (leer, wenn es keinen Marker gibt).
+    """
+    return read_marker(get_done_marker_path(output_dir, symbols)) or set()
+
+
+def get_missing_formats(output_dir, symbols, formats):
+    rendered = get_rendered_formats(output_dir, symbols)
+    return [fmt for fmt in formats if fmt not in rendered]
+
+
+def load_company_data(ticker_symbol, offline=False):
+    """
+    Holt Bilanzdaten und Unternehmensinformationen, bevorzugt aus dem lokalen Datenspeicher.
+
+    Args:
+        ticker_symbol (str): Das Ticker-Symbol.
+        offline (bool): Wenn True, werden keine Daten aus dem Netz geladen.
+
+    Returns:
+        tuple: (Bilanzdaten als pd.DataFrame, Unternehmensinformationen als CompanyInfo)
+    """
+    try:
+        info = load_company_info(ticker_symbol, offline)
+    except LookupError:
+        # Von batch_kpis.py berechnete Ticker haben Bilanzdaten, aber keine Unternehmensinformationen
+        info = CompanyInfo(ticker_symbol)
+    stored = load_from_data_store(ticker_symbol)
+    if stored is not None:
+        return stored['balance_sheet'], info
+    if offline:
+        raise LookupError(f"Keine lokalen Daten für {ticker_symbol} vorhanden (Offline-Modus).")
+
+    balance_sheet = get_balance_sheet(ticker_symbol)
+    save_to_data_store(ticker_symbol, balance_sheet)
+    return balance_sheet, info
+
+
+def create_structural_balance_sheet_figure(ticker_symbols, balance_sheets):
+    """
+    Erstellt die Strukturbilanz als Plotly-Tabelle für den statischen Export.
+
+    Args:
+        ticker_symbols (list): Liste der Ticker-Symbole.
+        balance_sheets (dict): Aufbereitete Bilanzdaten je Ticker.
+
+    Returns:
+        plotly.graph_objects.Figure: Die Strukturbilanz-Tabelle.
+    """
+    rows = {
+        'Unternehmen': [], 'Jahr': [], 'Anlagevermögen': [], 'Umlaufvermögen': [], 'Summe Aktiva': [],
+        'Eigenkapital': [], 'Langfristige Verbindlichkeiten': [], 'Kurzfristige Verbindlichkeiten': [],
+        'Summe Passiva': []
+    }
+
+    for ticker in ticker_symbols:
+        for row in get_structural_balance_sheet_rows(balance_sheets[ticker]):
+            rows['Unternehmen'].append(ticker)
+            rows['Jahr'].append(row['year'])
+            rows['Anlagevermögen'].append(f"{row['anlage']:,.0f} €")
+            rows['Umlaufvermögen'].append(f"{row['umlauf']:,.0f} €")
+            rows['Summe Aktiva'].append(f"{row['summe_aktiva']:,.0f} €")
+            rows['Eigenkapital'].append(f"{row['ek']:,.0f} €")
+            rows['Langfristige Verbindlichkeiten'].append(f"{row['fk_lang']:,.0f} €")
+            rows['Kurzfristige Verbindlichkeiten'].append(f"{row['fk_kurz']:,.0f} €")
+            rows['Summe Passiva'].append(f"{row['summe_passiva']:,.0f} €")
+
+    fig = go.Figure(data=[go.Table(
+        header=dict(values=list(rows.keys()),
+                    fill_color='#2b3e50',
+                    font=dict(color='white'),
+                    align='left'),
+        cells=dict(values=list(rows.values()),
+                   fill_color='lavender',
+                   align='left'))
+    ])
+    fig.update_layout(
+        title='Strukturbilanz',
+        height=len(rows['Jahr']) * 40 + 150,
+        margin=dict(l=20, r=20, t=60, b=20)
+    )
+    return fig
+
+
+def start_render_server():
+    """
+    Startet im Worker-Prozess einen dauerhaft laufenden Kaleido-Server.
+
+    Ohne Server startet `pio.write_images` bei jedem Aufruf einen eigenen Chrome-Prozess.
+    Der Server wird beim Beenden des Workers (auch nach max_tasks_per_child Berichten)
+    wieder gestoppt. atexit-Handler laufen in Worker-Prozessen nicht, daher wird dafür
+    ein Finalizer von multiprocessing verwendet.
+    """
+    # Plotly übergibt immer (leere) kopts, die bei laufendem Server ignoriert werden
+    warnings.filterwarnings('ignore', message='The kopts argument is ignored')
+    kaleido.start_sync_server(silence_warnings=True)
+    Finalize(None, kaleido.stop_sync_server, kwargs={'silence_warnings': True}, exitpriority=10)
+
+
+def merge_pdfs(page_paths, output_path):
+    """
+    Fügt einzelne PDF-Dateien in der angegebenen Reihenfolge zu einer Datei zusammen.
+
+    Args:
+        page_paths (list): Pfade der einzelnen PDF-Dateien.
+        output_path (str): Pfad des zusammengefügten PDFs.
+    """
+    writer = PdfWriter()
+    for path in page_paths:
+        writer.append(path)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        writer.write(f)
+    os.replace(tmp_path, output_path)
+
+
+def render_report(symbols, output_dir, formats, offline=False):
+    """
+    Erzeugt einen Bericht für ein Unternehmen bzw. eine Vergleichsgruppe.
+
+    Alle Abbildungen werden in einem Kaleido-Aufruf über den Server des Workers gerendert.
+    Scheitert eine Abbildung oder fehlen Daten, bleibt die Markierung unverändert, und
+    run_batch führt den Bericht mit der Fehlermeldung in der Zusammenfassung auf.
+
+    Args:
+        symbols (list): Ticker-Symbole des Berichts.
+        output_dir (str): Zielverzeichnis für alle Berichte.
+        formats (list): Ausgabeformate, z.B. ['png', 'pdf'].
+        offline (bool): Nur Daten aus dem lokalen Datenspeicher verwenden.
+
+    Returns:
+        tuple: (Berichtsname, Dauer in Sekunden, Fehlermeldung oder None)
+    """
+    start = time.perf_counter()
+    name = get_report_name(symbols)
+    try:
+        if len(symbols) > len(CONFIG['COLORS']['TICKER_COLORS']):
+            raise ValueError(f"Maximal {len(CONFIG['COLORS']['TICKER_COLORS'])} Ticker pro Bericht erlaubt.")
+
+        balance_sheets = {}
+        company_info = {}
+        for ticker in symbols:
+            balance_sheets[ticker], company_info[ticker] = load_company_data(ticker, offline)
+
+        figures = {
+            'unternehmensinformationen': create_company_table(symbols, company_info),
+            'strukturbilanz': create_structural_balance_sheet_figure(symbols, balance_sheets),
+            'kapital_und_verbindlichkeiten': create_dashboard(symbols, balance_sheets),
+            'kpis_im_zeitverlauf': create_line_chart(symbols, balance_sheets),
+            'deckungsgrade': create_coverage_ratios_chart(symbols, balance_sheets),
+            'liquiditaetsgrade': create_liquidity_ratios_chart(symbols, balance_sheets),
+        }
+
+        report_dir = os.path.join(output_dir, name)
+        os.makedirs(report_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=report_dir) as page_dir:
+            figs, paths, pdf_pages = [], [], []
+            for figure_name, fig in figures.items():
+                for fmt in formats:
+                    figs.append(fig)
+                    if fmt == 'pdf':
+                        # Einzelseiten werden danach zu einem PDF pro Bericht zusammengefügt
+                        pdf_pages.append(os.path.join(page_dir, f"{figure_name}.pdf"))
+                        paths.append(pdf_pages[-1])
+                    else:
+                        paths.append(os.path.join(report_dir, f"{figure_name}.{fmt}"))
+            # Alle Abbildungen eines Berichts in einem Kaleido-Aufruf rendern
+            pio.write_images(figs, paths)
+            # Kaleido bricht bei Fehlern in einzelnen Abbildungen nicht ab, sondern lässt die Datei aus
+            missing = [os.path.basename(path) for path in paths if not os.path.exists(path)]
+            if missing:
+                raise RuntimeError(f"Abbildungen nicht erzeugt: {', '.join(missing)}")
+            if pdf_pages:
+                merge_pdfs(pdf_pages, os.path.join(report_dir, f"{name}.pdf"))
+
+        # Marker erst am Ende schreiben, damit halbfertige Berichte erneut erzeugt werden.
+        # Früher erzeugte Formate bleiben eingetragen, ihre Dateien liegen weiterhin vor.
+        write_marker(get_done_marker_path(output_dir, symbols), get_rendered_formats(output_dir, symbols) | set(formats))
+        return name, time.perf_counter() - start, None
+    except Exception as e:
+        return name, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+def run_batch(groups, output_dir, formats, workers=None, max_tasks_per_child=50, offline=False, force=False):
+    """
+    Erzeugt alle Berichte parallel in einem Prozesspool.
+
+    Es werden nie mehr als 2 * workers Aufträge gleichzeitig eingereicht, und jeder
+    Worker wird nach max_tasks_per_child Berichten neu gestartet, damit der
+    Speicherverbrauch begrenzt bleibt. Jeder Worker verwendet einen eigenen Kaleido-Server.
+
+    Args:
+        groups (list): Liste von Ticker-Listen, eine pro Bericht.
+        output_dir (str): Zielverzeichnis für alle Berichte.
+        formats (list): Ausgabeformate, z.B. ['png', 'pdf'].
+        workers (int, optional): Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+        max_tasks_per_child (int): Berichte pro Worker, bevor dieser neu gestartet wird.
+        offline (bool): Nur Daten aus dem lokalen Datenspeicher verwenden.
+        force (bool): Bereits fertige Berichte erneut erzeugen.
+
+    Returns:
+        dict: Zusammenfassung mit 'done', 'skipped', 'errors' und 'elapsed'.
+    """
+    # Ein Bericht wird nur übersprungen, wenn alle angeforderten Formate vorliegen;
+    # sonst werden genau die fehlenden Formate erzeugt.
+    pending = []
+    for group in groups:
+        missing_formats = list(formats) if force else get_missing_formats(output_dir, group, formats)
+        if missing_formats:
+            pending.append((group, missing_formats))
+    summary = {'done': 0, 'skipped': len(groups) - len(pending), 'errors': {}, 'elapsed': 0.0}
+    start = time.perf_counter()
+
+    jobs = ((group, output_dir, missing_formats, offline) for group, missing_formats in pending)
+    for name, duration, error in run_in_pool(render_report, jobs, workers, max_tasks_per_child, start_render_server):
+        if error:
+            summary['errors'][name] = error
+            print(f"Fehler bei Bericht {name}: {error}")
+        else:
+            summary['done'] += 1
+            print(f"Bericht {name} erstellt ({duration:.2f} s)")
+
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Erzeugt statische Strukturbilanz- und KPI-Berichte im Batch.")
+    parser.add_argument('input', help="Textdatei mit einem Ticker bzw. einer kommagetrennten Vergleichsgruppe pro Zeile")
+    parser.add_argument('--output-dir', default='reports', help="Zielverzeichnis der Berichte")
+    parser.add_argument('--formats', nargs='+', default=['png', 'pdf'], choices=['png', 'pdf', 'svg', 'jpeg'])
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl der Worker-Prozesse")
+    parser.add_argument('--max-tasks-per-child', type=int, default=50,
+                        help="Berichte pro Worker, bevor dieser zur Speicherbegrenzung neu gestartet wird")
+    parser.add_argument('--offline', action='store_true', help="Nur Daten aus dem lokalen Datenspeicher verwenden")
+    parser.add_argument('--force', action='store_true', help="Bereits fertige Berichte erneut erzeugen")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="Zeitbudget in Sekunden; bei Überschreitung endet das Programm mit Exit-Code 1")
+    args = parser.parse_args(argv)
+
+    groups = read_report_groups(args.input)
+    summary = run_batch(groups, args.output_dir, args.formats, args.workers,
+                        args.max_tasks_per_child, args.offline, args.force)
+
+    rate = summary['done'] / summary['elapsed'] if summary['elapsed'] else 0.0
+    print(f"{summary['done']} Berichte erstellt, {summary['skipped']} übersprungen, "
+          f"{len(summary['errors'])} Fehler in {summary['elapsed']:.1f} s ({rate:.2f} Berichte/s)")
+
+    if summary['errors']:
+        return 1
+    if args.time_budget is not None and summary['elapsed'] > args.time_budget:
+        print(f"Zeitbudget von {args.time_budget:.1f} s überschritten.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -86,111 +86,196 @@ document.getElementById('ticker-input').addEventListener('keydown', function (ev
     }
 });
 
+let dashboardSource = null;
+let renderedTickers = []; // Ticker des aktuell angezeigten Dashboards
+let tickerColors = {}; // Farbe je angezeigtem Ticker
+
+// Zeigt einen Abschnitt (Titel, Container, Beschreibung) des Dashboards an
+function showSection(name) {
+    document.getElementById(`${name}-title`).classList.remove('hidden');
+    document.getElementById(`${name}-description`).classList.remove('hidden');
+}
+
 // Funktion zum Erstellen des Dashboards
-async function createDashboard() {
-    const tableContainer = document.getElementById('table-container');
-    tableContainer.innerHTML = '';
+// Ist bereits ein Dashboard sichtbar, werden nur die Änderungen (hinzugefügte/entfernte Ticker) geladen.
+function createDashboard() {
+    if (!dashboardSource && renderedTickers.length > 0) {
+        const added = tickers.filter(ticker => !renderedTickers.includes(ticker));
+        const removed = renderedTickers.filter(ticker => !tickers.includes(ticker));
+        if (added.length > 0 || removed.length > 0) {
+            applyDashboardDelta(added, removed);
+        }
+        return;
+    }
+    createFullDashboard();
+}
 
-    // Tabelle erstellen
-    const response = await fetch('/update_table', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+// Erstellt das vollständige Dashboard
+// Die Inhalte werden über Server-Sent Events schrittweise empfangen und sofort angezeigt.
+function createFullDashboard() {
+    if (dashboardSource) {
+        dashboardSource.close();
+    }
+    renderedTickers = [];
+
+    ['table', 'structural-balance-sheet', 'dashboard', 'line-chart', 'coverage-ratios', 'liquidity-ratios'].forEach(name => {
+        document.getElementById(`${name}-container`).innerHTML = '';
     });
-    const fig = await response.json();
-    const figData = JSON.parse(fig);
-    Plotly.newPlot('table-container', figData.data, figData.layout, { responsive: true });
-    document.getElementById('table-title').classList.remove('hidden');
-    document.getElementById('table-description').classList.remove('hidden');
-    alert("Dashboard wurde erstellt!");
-
-    // Deaktiviere den Button nach dem Erstellen
+
+    // Deaktiviere den Button während des Aufbaus, um doppeltes Absenden zu vermeiden
     const createButton = document.getElementById("create-dashboard-button");
     createButton.disabled = true;
 
-    // Strukturbilanz-Tabelle erstellen
-    const structuralBalanceSheetResponse = await fetch('/update_structural_balance_sheet', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+    const progress = document.getElementById('dashboard-progress');
+    progress.textContent = 'Daten werden geladen...';
+    progress.classList.remove('hidden');
+
+    const source = new EventSource(`/dashboard_events?symbols=${encodeURIComponent(tickers.join(','))}`);
+    dashboardSource = source;
+
+    source.addEventListener('progress', event => {
+        const data = JSON.parse(event.data);
+        if (data.step === 'fetch') {
+            progress.textContent = `${data.ticker}: Daten geladen`;
+        } else if (data.step === 'kpis') {
+            progress.textContent = `${data.ticker}: Kennzahlen berechnet`;
+        } else if (data.step === 'chart') {
+            progress.textContent = `Diagramm "${data.name}" erstellt`;
+        }
     });
-    const structuralBalanceSheetData = await structuralBalanceSheetResponse.json();
-    if (structuralBalanceSheetData.html) {
-        document.getElementById('structural-balance-sheet-container').innerHTML = structuralBalanceSheetData.html;
-        document.getElementById('structural-balance-sheet-title').classList.remove('hidden');
-        document.getElementById('structural-balance-sheet-description').classList.remove('hidden');
-    } else {
-        console.error("Fehler beim Laden der Strukturbilanz-Tabelle:", structuralBalanceSheetData.error);
+
+    source.addEventListener('figure', event => {
+        const data = JSON.parse(event.data);
+        Plotly.newPlot(`${data.name}-container`, data.figure.data, data.figure.layout, { responsive: true });
+        showSection(data.name);
+    });
+
+    source.addEventListener('structural_balance_sheet', event => {
+        const data = JSON.parse(event.data);
+        document.getElementById('structural-balance-sheet-container').insertAdjacentHTML('beforeend', data.html);
+        showSection('structural-balance-sheet');
+    });
+
+    source.addEventListener('done', event => {
+        const data = JSON.parse(event.data);
+        source.close();
+        dashboardSource = null;
+        renderedTickers = data.symbols;
+        tickerColors = data.colors;
+        progress.classList.add('hidden');
+
+        // Beschreibung einklappen
+        const descriptionBox = document.querySelector('.description');
+        descriptionBox.classList.add('hidden');
+        descriptionBox.style.maxHeight = '0';
+
+        // Button-Text aktualisieren
+        const toggleButton = document.getElementById('toggle-description-button');
+        toggleButton.textContent = 'Beschreibung einblenden';
+    });
+
+    source.addEventListener('build_error', event => {
+        const data = JSON.parse(event.data);
+        source.close();
+        dashboardSource = null;
+        progress.classList.add('hidden');
+        document.getElementById('error-message').textContent = data.error;
+        createButton.disabled = false;
+    });
+
+    // Verbindungsfehler: nicht automatisch neu verbinden, da dies einen neuen Aufbau starten würde
+    source.onerror = () => {
+        if (dashboardSource !== source) {
+            return;
+        }
+        source.close();
+        dashboardSource = null;
+        progress.classList.add('hidden');
+        document.getElementById('error-message').textContent = 'Verbindung zum Server unterbrochen.';
+        createButton.disabled = false;
+    };
+}
+
+// Wendet die Änderungen für hinzugefügte und entfernte Ticker auf das angezeigte Dashboard an
+async function applyDashboardDelta(added, removed) {
+    const createButton = document.getElementById("create-dashboard-button");
+    createButton.disabled = true;
+
+    // Aktuell im Liniendiagramm ausgewählte KPI beibehalten
+    const lineChart = document.getElementById('line-chart-container');
+    const visibleTrace = lineChart.data.find(trace => trace.visible === true);
+
+    let delta;
+    try {
+        const response = await fetch('/update_dashboard_delta', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                symbols: tickers,
+                added,
+                removed,
+                colors: tickerColors,
+                visible_kpi: visibleTrace ? visibleTrace.meta.kpi : null
+            })
+        });
+        delta = await response.json();
+        if (!response.ok) {
+            throw new Error(delta.error);
+        }
+    } catch (error) {
+        // Rückfall auf den vollständigen Aufbau
+        console.error("Fehler beim Aktualisieren des Dashboards:", error);
+        createFullDashboard();
+        return;
     }
 
-    // Dashboard erstellen
-    const dashboardResponse = await fetch('/update_dashboard', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+    // Traces entfernter Ticker löschen und neue Traces hinzufügen
+    Object.keys(delta.add).forEach(name => {
+        const container = document.getElementById(`${name}-container`);
+        const indices = container.data
+            .map((trace, index) => delta.remove.includes(trace.meta.ticker) ? index : -1)
+            .filter(index => index !== -1);
+        if (indices.length > 0) {
+            Plotly.deleteTraces(container, indices);
+        }
+        if (delta.add[name].length > 0) {
+            Plotly.addTraces(container, delta.add[name]);
+        }
     });
-    const dashboardFig = await dashboardResponse.json();
-    const dashboardFigData = JSON.parse(dashboardFig);
-    Plotly.newPlot('dashboard-container', dashboardFigData.data, dashboardFigData.layout, { responsive: true });
-    document.getElementById('dashboard-title').classList.remove('hidden');
-    document.getElementById('dashboard-description').classList.remove('hidden');
-
-    // Liniendiagramm erstellen
-    const lineChartResponse = await fetch('/update_line_chart', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+
+    // Sichtbarkeitsmasken des Liniendiagramms an die neue Trace-Reihenfolge anpassen
+    const menuUpdate = {};
+    delta.line_chart_kpis.forEach((kpi, index) => {
+        menuUpdate[`updatemenus[0].buttons[${index}].args`] = [{ visible: lineChart.data.map(trace => trace.meta.kpi === kpi) }];
     });
-    const lineChartFig = await lineChartResponse.json();
-    const lineChartFigData = JSON.parse(lineChartFig);
-    Plotly.newPlot('line-chart-container', lineChartFigData.data, lineChartFigData.layout, { responsive: true });
-    document.getElementById('line-chart-title').classList.remove('hidden');
-    document.getElementById('line-chart-description').classList.remove('hidden');
-
-    // Anlagendeckungsgrade erstellen
-    const coverageRatiosResponse = await fetch('/update_coverage_ratios_chart', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+    Plotly.relayout(lineChart, menuUpdate);
+
+    // Legende im Balkendiagramm: jeweils erster Balken je Komponente
+    const dashboardChart = document.getElementById('dashboard-container');
+    const seenComponents = new Set();
+    const showLegend = dashboardChart.data.map(trace => {
+        const first = !seenComponents.has(trace.name);
+        seenComponents.add(trace.name);
+        return first;
     });
-    const coverageRatiosFig = await coverageRatiosResponse.json();
-    const coverageRatiosFigData = JSON.parse(coverageRatiosFig);
-    Plotly.newPlot('coverage-ratios-container', coverageRatiosFigData.data, coverageRatiosFigData.layout, { responsive: true });
-    document.getElementById('coverage-ratios-title').classList.remove('hidden');
-    document.getElementById('coverage-ratios-description').classList.remove('hidden');
-
-    // Liquiditätsgrade erstellen
-    const liquidityRatiosResponse = await fetch('/update_liquidity_ratios_chart', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ symbols: tickers })
+    Plotly.restyle(dashboardChart, { showlegend: showLegend });
+
+    // Strukturbilanz-Tabellen entfernen bzw. anhängen
+    const structuralContainer = document.getElementById('structural-balance-sheet-container');
+    removed.forEach(ticker => {
+        structuralContainer.querySelectorAll(`.bilanz-ticker[data-ticker="${ticker}"]`).forEach(element => element.remove());
+    });
+    added.forEach(ticker => {
+        structuralContainer.insertAdjacentHTML('beforeend', delta.structural_balance_sheets[ticker] || '');
     });
-    const liquidityRatiosFig = await liquidityRatiosResponse.json();
-    const liquidityRatiosFigData = JSON.parse(liquidityRatiosFig);
-    Plotly.newPlot('liquidity-ratios-container', liquidityRatiosFigData.data, liquidityRatiosFigData.layout, { responsive: true });
-    document.getElementById('liquidity-ratios-title').classList.remove('hidden');
-    document.getElementById('liquidity-ratios-description').classList.remove('hidden');
 
-    // Beschreibung einklappen
-    const descriptionBox = document.querySelector('.description');
-    descriptionBox.classList.add('hidden');
-    descriptionBox.style.maxHeight = '0';
+    // Unternehmenstabelle aus zwischengespeicherten Daten neu zeichnen
+    Plotly.react('table-container', delta.table.data, delta.table.layout, { responsive: true });
 
-    // Button-Text aktualisieren
-    const toggleButton = document.getElementById('toggle-description-button');
-    toggleButton.textContent = 'Beschreibung einblenden';
+    renderedTickers = [...tickers];
+    tickerColors = delta.colors;
 }
 
 function saveDashboard() {